@@ -1,7 +1,5 @@
 """Main entry point for KiCad MCP Server."""
 
-import sys
-
 
 def main() -> None:
     """Entry point for running the MCP server."""
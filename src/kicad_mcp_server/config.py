@@ -1,8 +1,6 @@
 """Configuration management for KiCad MCP Server."""
 
 import os
-from pathlib import Path
-from typing import Optional
 
 from dotenv import load_dotenv
 
@@ -36,6 +34,9 @@ class Config:
         self.default_test_framework: str = os.getenv("DEFAULT_TEST_FRAMEWORK", "pytest")
         self.default_test_type: str = os.getenv("DEFAULT_TEST_TYPE", "connectivity")
 
+        # Include Python tracebacks in tool error messages
+        self.debug: bool = os.getenv("KICAD_MCP_DEBUG", "false").lower() == "true"
+
     @classmethod
     def get_instance(cls) -> "Config":
         """Get singleton instance of Config."""
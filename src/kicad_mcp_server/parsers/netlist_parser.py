@@ -1,13 +1,10 @@
 """KiCad netlist parser for accurate component network tracking."""
 
-import re
 import xml.etree.ElementTree as ET
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Optional
 
-from ..utils.file_handlers import validate_kicad_file
-
 
 @dataclass
 class NetlistComponent:
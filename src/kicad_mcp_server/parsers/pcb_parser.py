@@ -1,8 +1,7 @@
 """PCB file parser wrapper using kicad-skip."""
 
 import re
-from dataclasses import dataclass, field
-from pathlib import Path
+from dataclasses import dataclass
 from typing import Any, Optional
 
 from ..utils.file_handlers import validate_kicad_file
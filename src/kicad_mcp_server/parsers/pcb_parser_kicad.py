@@ -1,11 +1,13 @@
 """PCB file parser using KiCad Python API (pcbnew)."""
 
 from dataclasses import dataclass, field
-from pathlib import Path
 from typing import Any, Optional
 
 from ..utils.file_handlers import validate_kicad_file
 
+# Net names left out of get_nets (ground and the unconnected net)
+_SKIPPED_NET_NAMES = frozenset({"GND", "0"})
+
 
 @dataclass
 class PCBFootprint:
@@ -136,7 +138,7 @@ class PCBParserKiCad:
         nets_dict = net_info_list.NetsByName()
         for net_name, net in nets_dict.items():
             name = str(net_name)
-            if name and name not in ["", "GND", "0"]:  # Skip empty/GND nets
+            if name and name not in _SKIPPED_NET_NAMES:
                 nets.append(PCBNet(
                     name=name,
                     code=net.GetNetCode(),
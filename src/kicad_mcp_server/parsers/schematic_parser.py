@@ -1,9 +1,10 @@
 """Schematic file parser wrapper using kicad-skip."""
 
+import os
 import re
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Iterator, Optional
 
 from ..utils.file_handlers import validate_kicad_file
 
@@ -11,6 +12,22 @@ from ..utils.file_handlers import validate_kicad_file
 KICAD_SYMBOL_FLAGS = ("dnp", "in_bom", "on_board", "exclude_from_sim")
 KICAD_FLAG_DEFAULTS = {"dnp": False, "in_bom": True, "on_board": True, "exclude_from_sim": False}
 
+# Leading letters of a reference designator ("R" in "R12", "SW" in "SW1")
+_REF_PREFIX_RE = re.compile(r"[A-Za-z]+")
+
+# Label names that trace_net treats as signal connections
+_SIGNAL_LABEL_RE = re.compile(r"I2C|SCL|SDA|SMBUS|PMIC|GPIO|EN|INT", re.IGNORECASE)
+
+# Top-level lib_symbols entry ("Device:R"); sub-symbols have no library prefix
+_LIB_SYMBOL_RE = re.compile(r'\(symbol\s+"([^"]*:[^"]*)"')
+
+# Pin in a lib symbol: (pin <elec_type> <graphic> ... (name "X") (number "N"))
+_LIB_PIN_RE = re.compile(
+    r'\(pin\s+(\w+)\s+\w+\s[\s\S]*?'
+    r'\(name\s+"([^"]*)"[\s\S]*?\)'
+    r'\s*\(number\s+"([^"]*)"',
+)
+
 
 @dataclass
 class SchematicComponent:
@@ -25,6 +42,12 @@ class SchematicComponent:
     unit: Optional[int] = None
     pins: list[dict[str, Any]] = field(default_factory=list)
     flags: dict[str, bool] = field(default_factory=lambda: dict(KICAD_FLAG_DEFAULTS))
+    prefix: str = field(init=False, default="")
+
+    def __post_init__(self) -> None:
+        """Derive the reference prefix once so tools don't re-extract it."""
+        m = _REF_PREFIX_RE.match(self.reference)
+        self.prefix = m.group(0) if m else ""
 
     @classmethod
     def from_kicad_skip(cls, data: dict[str, Any]) -> "SchematicComponent":
@@ -97,23 +120,61 @@ class SchematicPin:
         )
 
 
+@dataclass(slots=True)
+class SchematicSnapshot:
+    """Everything a schematic-wide query needs, gathered from one parse."""
+
+    title_block: dict[str, str]
+    components: list[SchematicComponent]
+    nets: list[SchematicNet]
+    sheets: list[dict[str, str]]
+
+
 class SchematicParser:
     """Parser for KiCad schematic files (.kicad_sch)."""
 
-    def __init__(self, file_path: str) -> None:
+    def __init__(self, file_path: str, content: Optional[str] = None) -> None:
         """Initialize parser with schematic file.
 
         Args:
             file_path: Path to .kicad_sch file
+            content: Schematic text already in memory; when given, file_path
+                is only used as the reported name and is not read or validated
 
         Raises:
             FileNotFoundError: If file doesn't exist
             ValueError: If file is not a .kicad_sch file
         """
-        self.file_path = validate_kicad_file(file_path, ".kicad_sch")
+        if content is None:
+            self.file_path = validate_kicad_file(file_path, ".kicad_sch")
+        else:
+            self.file_path = Path(file_path)
+        self._content = content
         self._data: Optional[dict[str, Any]] = None
+        self._components: Optional[list[SchematicComponent]] = None
+        self._nets: Optional[list[SchematicNet]] = None
+        self._by_ref: Optional[dict[str, SchematicComponent]] = None
         self._lib_symbols_lookup: dict[str, dict[str, dict[str, str]]] = {}
 
+    @classmethod
+    def from_bytes(cls, buf: bytes, file_path: str = "memory.kicad_sch") -> "SchematicParser":
+        """Create a parser over schematic content already in memory.
+
+        Args:
+            buf: UTF-8 encoded .kicad_sch content (bytes or any buffer, e.g. mmap)
+            file_path: Name reported as the schematic path; not read or validated
+
+        Returns:
+            Parser that never touches the filesystem
+        """
+        return cls(file_path, content=str(buf, "utf-8"))
+
+    def _read_content(self) -> str:
+        """Return the schematic text, from memory if the parser was built from bytes."""
+        if self._content is not None:
+            return self._content
+        return self.file_path.read_text()
+
     def _parse_file(self) -> dict[str, Any]:
         """Parse the schematic file.
 
@@ -129,9 +190,7 @@ class SchematicParser:
 
         # Simple text-based parser for .kicad_sch (S-expression format)
         # In production, use kicad-skip library
-        import re
-
-        content = self.file_path.read_text()
+        content = self._read_content()
 
         # Parse lib_symbols first so _parse_components can use it
         self._lib_symbols_lookup = self._parse_lib_symbols(content)
@@ -180,7 +239,7 @@ class SchematicParser:
         li = 0
         while li < len(lines):
             line = lines[li].strip()
-            top_match = re.match(r'\(symbol\s+"([^"]*:[^"]*)"', line)
+            top_match = _LIB_SYMBOL_RE.match(line)
             if top_match:
                 lib_id = top_match.group(1)
                 # Extract full block for this top-level symbol
@@ -199,14 +258,8 @@ class SchematicParser:
                 sym_block = '\n'.join(sym_lines)
 
                 # Extract pins from the entire symbol block (including sub-symbols)
-                # Pin format: (pin <elec_type> <graphic> ... (name "X") (number "N"))
-                pin_pattern = re.compile(
-                    r'\(pin\s+(\w+)\s+\w+\s[\s\S]*?'
-                    r'\(name\s+"([^"]*)"[\s\S]*?\)'
-                    r'\s*\(number\s+"([^"]*)"',
-                )
                 pins = {}
-                for pin_match in pin_pattern.finditer(sym_block):
+                for pin_match in _LIB_PIN_RE.finditer(sym_block):
                     elec_type = pin_match.group(1)
                     name = pin_match.group(2)
                     number = pin_match.group(3)
@@ -251,8 +304,10 @@ class SchematicParser:
 
     def _parse_components(self, content: str) -> list[dict[str, Any]]:
         """Parse components from schematic."""
-        components = []
+        return list(self._iter_component_data(content))
 
+    def _iter_component_data(self, content: str) -> Iterator[dict[str, Any]]:
+        """Yield raw component data in file order."""
         # Find all symbol instances
         # Pattern: (symbol (at x y rotation) (lib_id "...") ... (property "Reference" "...") ...)
         # Match from (symbol to the closing )
@@ -337,7 +392,7 @@ class SchematicParser:
                     if footprint:
                         properties.append({"key": "Footprint", "value": footprint})
 
-                    components.append({
+                    yield {
                         "lib_id": lib_id,
                         "reference": reference,
                         "value": value,
@@ -345,14 +400,12 @@ class SchematicParser:
                         "at": {"x": x, "y": y},
                         "pins": pins,
                         "flags": flags,
-                    })
+                    }
 
                 i = j + 1
             else:
                 i += 1
 
-        return components
-
     def _parse_nets(self, content: str) -> list[dict[str, Any]]:
         """Parse nets from schematic."""
         nets = {}
@@ -433,20 +486,51 @@ class SchematicParser:
     def get_components(self) -> list[SchematicComponent]:
         """Get all components from schematic.
 
+        The list is built once per parser and shared between calls; treat it
+        as read-only.
+
         Returns:
             List of components
         """
-        data = self._parse_file()
-        return [SchematicComponent.from_kicad_skip(c) for c in data["components"]]
+        if self._components is None:
+            data = self._parse_file()
+            self._components = [SchematicComponent.from_kicad_skip(c) for c in data["components"]]
+        return self._components
+
+    def iter_components(self) -> Iterator[SchematicComponent]:
+        """Iterate over components in file order, parsing them on demand.
+
+        Symbols after the point where the caller stops iterating are never
+        parsed, so looking for a few references can exit early. Components
+        yielded here are not cached; once the file has been fully parsed the
+        cached list is used instead.
+
+        Yields:
+            Components
+        """
+        if self._data is not None:
+            yield from self.get_components()
+            return
+
+        content = self._read_content()
+        if not self._lib_symbols_lookup:
+            self._lib_symbols_lookup = self._parse_lib_symbols(content)
+        for data in self._iter_component_data(content):
+            yield SchematicComponent.from_kicad_skip(data)
 
     def get_nets(self) -> list[SchematicNet]:
         """Get all nets from schematic.
 
+        The list is built once per parser and shared between calls; treat it
+        as read-only.
+
         Returns:
             List of nets
         """
-        data = self._parse_file()
-        return [SchematicNet.from_kicad_skip(n) for n in data["nets"]]
+        if self._nets is None:
+            data = self._parse_file()
+            self._nets = [SchematicNet.from_kicad_skip(n) for n in data["nets"]]
+        return self._nets
 
     def get_title_block(self) -> dict[str, str]:
         """Get title block information.
@@ -466,6 +550,20 @@ class SchematicParser:
         data = self._parse_file()
         return data["sheets"]
 
+    def get_all(self) -> SchematicSnapshot:
+        """Get title block, components, nets and sheets in one call.
+
+        Returns:
+            Snapshot of the parsed schematic
+        """
+        data = self._parse_file()
+        return SchematicSnapshot(
+            title_block=data["title_block"],
+            components=self.get_components(),
+            nets=self.get_nets(),
+            sheets=data["sheets"],
+        )
+
     def get_component_by_reference(self, reference: str) -> Optional[SchematicComponent]:
         """Get a component by its reference designator.
 
@@ -475,21 +573,30 @@ class SchematicParser:
         Returns:
             Component if found, None otherwise
         """
-        for component in self.get_components():
-            if component.reference == reference:
-                return component
-        return None
-
-    def search_components(self, pattern: str) -> list[SchematicComponent]:
+        if self._by_ref is None:
+            by_ref: dict[str, SchematicComponent] = {}
+            for component in self.get_components():
+                # Multi-unit symbols repeat a reference; keep the first unit
+                by_ref.setdefault(component.reference, component)
+            self._by_ref = by_ref
+        return self._by_ref.get(reference)
+
+    def search_components(
+        self, pattern: str, limit: Optional[int] = None
+    ) -> list[SchematicComponent]:
         """Search for components by pattern.
 
         Args:
             pattern: Search pattern (matches reference, value, or library_id)
+            limit: Optional maximum number of matches; the scan stops once
+                this many components have matched. A limit of 0 or less
+                matches nothing
 
         Returns:
             List of matching components
         """
-        import re
+        if limit is not None and limit <= 0:
+            return []
 
         regex = re.compile(pattern, re.IGNORECASE)
         results = []
@@ -501,6 +608,8 @@ class SchematicParser:
                 or regex.search(component.library_id)
             ):
                 results.append(component)
+                if limit is not None and len(results) >= limit:
+                    break
 
         return results
 
@@ -518,7 +627,7 @@ class SchematicParser:
                 "connected_components": ["comp1", "comp2"]
             }
         """
-        content = self.file_path.read_text()
+        content = self._read_content()
 
         # Find the component instance
         comp_pattern = rf'\(symbol\s+[\s\S]*?\(property\s+"Reference"\s+"{re.escape(reference)}"'
@@ -616,8 +725,7 @@ class SchematicParser:
         # Check for hierarchical labels that indicate function
         for label in connections["nearby_labels"]:
             label_name = label["name"]
-            if any(keyword in label_name.upper() for keyword in
-                   ["I2C", "SCL", "SDA", "SMBUS", "PMIC", "GPIO", "EN", "INT"]):
+            if _SIGNAL_LABEL_RE.search(label_name):
                 inferred_nets.append({
                     "name": label_name,
                     "type": "signal",
@@ -637,9 +745,7 @@ class SchematicParser:
         Returns:
             Dictionary mapping each point to its connected neighbors
         """
-        import re
-
-        content = self.file_path.read_text()
+        content = self._read_content()
 
         # Find all wire segments
         wire_pattern = r'\(wire\s+\(pts\s+\(xy\s+([\d.]+)\s+([\d.]+)\)\s+\(xy\s+([\d.]+)\s+([\d.]+)\)'
@@ -693,8 +799,6 @@ class SchematicParser:
         Returns:
             Dictionary with traced connections and labels
         """
-        import re
-
         # Get component position
         comp = self.get_component_by_reference(reference)
         if not comp:
@@ -706,7 +810,7 @@ class SchematicParser:
         network = self.build_wire_network()
 
         # Find all labels
-        content = self.file_path.read_text()
+        content = self._read_content()
 
         # Find hierarchical labels
         h_labels = []
@@ -757,6 +861,7 @@ class SchematicParser:
         queue = [start_point]
         trace_path = []
         connected_labels = []
+        seen_labels = set()
 
         while queue and len(visited) < max_depth:
             point = queue.pop(0)
@@ -769,9 +874,12 @@ class SchematicParser:
             # Check if this point is near a label
             label_tolerance = 5.0  # 5mm tolerance for label matching
             for label in all_labels:
+                if label["name"] in seen_labels:
+                    continue
                 lx, ly = label["position"]
                 dist = ((point[0] - lx)**2 + (point[1] - ly)**2)**0.5
-                if dist < label_tolerance and not any(l["name"] == label["name"] for l in connected_labels):
+                if dist < label_tolerance:
+                    seen_labels.add(label["name"])
                     connected_labels.append({
                         "name": label["name"],
                         "position": label["position"],
@@ -804,3 +912,51 @@ class SchematicParser:
             "connected_labels": connected_labels,
             "trace_path": trace_path,
         }
+
+
+# Shared parsers, one per schematic:
+# abspath -> (st_mtime_ns, st_size, parser)
+_PARSER_CACHE: dict[str, tuple[int, int, SchematicParser]] = {}
+_PARSER_CACHE_SIZE = 32
+
+
+def get_parser(file_path: str) -> SchematicParser:
+    """Get a shared parser for a schematic file.
+
+    Tools that chain queries on the same file reuse one parsed schematic. The
+    cache entry is keyed on the file's mtime and size, so edits on disk
+    trigger a fresh parse.
+
+    Args:
+        file_path: Path to .kicad_sch file
+
+    Returns:
+        SchematicParser for the file's current contents
+
+    Raises:
+        FileNotFoundError: If file doesn't exist
+        ValueError: If file is not a .kicad_sch file
+    """
+    key = os.path.abspath(file_path)
+    cached = _PARSER_CACHE.pop(key, None)
+    try:
+        st = os.stat(key)
+    except FileNotFoundError:
+        # Same message SchematicParser gives for a missing file
+        raise FileNotFoundError(f"File not found: {file_path}") from None
+    if cached and cached[:2] == (st.st_mtime_ns, st.st_size):
+        parser = cached[2]
+    else:
+        parser = SchematicParser(file_path)
+        if len(_PARSER_CACHE) >= _PARSER_CACHE_SIZE:
+            del _PARSER_CACHE[next(iter(_PARSER_CACHE))]
+    _PARSER_CACHE[key] = (st.st_mtime_ns, st.st_size, parser)
+    return parser
+
+
+def invalidate_parser_cache(file_path: Optional[str] = None) -> None:
+    """Drop the cached parser for a file, or every cached parser if None."""
+    if file_path is None:
+        _PARSER_CACHE.clear()
+    else:
+        _PARSER_CACHE.pop(os.path.abspath(file_path), None)
@@ -1,7 +1,6 @@
 """Main MCP server setup for KiCad integration."""
 
 from fastmcp import FastMCP
-from typing import Optional
 
 from .config import config
 
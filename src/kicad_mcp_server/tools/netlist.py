@@ -1,12 +1,41 @@
 """Netlist generation and analysis tools for KiCad MCP Server."""
 
-import subprocess
+import asyncio
+import re
+import shutil
 from pathlib import Path
 from typing import Optional
 from ..server import mcp
 from ..parsers.netlist_parser import NetlistParser
 
 
+_KICAD_CLI_NOT_FOUND = """⚠️ kicad-cli not found in PATH.
+
+Please:
+1. Install KiCad 7+ (https://www.kicad.org/)
+2. Ensure kicad-cli is in system PATH
+3. Or use KiCad GUI to export netlist manually
+
+**Manual export:**
+Open schematic → Tools → Generate Netlist → KiCad XML format
+"""
+
+
+# Executables found on PATH: name -> path. Misses are not cached, so a
+# kicad-cli installed while the server runs is picked up on the next call.
+_WHICH_CACHE: dict[str, str] = {}
+
+
+def _which(name: str) -> Optional[str]:
+    """Locate an executable on PATH, caching successful lookups."""
+    found = _WHICH_CACHE.get(name)
+    if found is None:
+        found = shutil.which(name)
+        if found is not None:
+            _WHICH_CACHE[name] = found
+    return found
+
+
 def _find_root_schematic(sch_path: Path) -> Optional[Path]:
     """If sch_path is a sub-sheet, return the root schematic instead.
 
@@ -58,10 +87,14 @@ async def generate_netlist(
 
         # Try to use KiCad's netlist export
         # Note: This requires KiCad to be installed and in PATH
+        kicad_cli = _which("kicad-cli")
+        if not kicad_cli:
+            return _KICAD_CLI_NOT_FOUND
+
         try:
             # Use kicad-cli for headless export (no display required)
             cmd = [
-                "kicad-cli",
+                kicad_cli,
                 "sch",
                 "export",
                 "netlist",
@@ -72,14 +105,19 @@ async def generate_netlist(
                 str(sch_path),
             ]
 
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=30,
+            proc = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.DEVNULL,
             )
-
-            if result.returncode == 0 and netlist_path.exists():
+            try:
+                await asyncio.wait_for(proc.wait(), timeout=30)
+            except asyncio.TimeoutError:
+                proc.kill()
+                await proc.wait()
+                return "❌ Error generating netlist: kicad-cli timed out after 30 seconds"
+
+            if proc.returncode == 0 and netlist_path.exists():
                 return f"""✅ Netlist generated successfully
 
 **Output:** {netlist_path}
@@ -106,16 +144,9 @@ Use KiCad Schematic Editor GUI to export netlist.
 """
 
         except FileNotFoundError:
-            return """⚠️ kicad-cli not found in PATH.
-
-Please:
-1. Install KiCad 7+ (https://www.kicad.org/)
-2. Ensure kicad-cli is in system PATH
-3. Or use KiCad GUI to export netlist manually
-
-**Manual export:**
-Open schematic → Tools → Generate Netlist → KiCad XML format
-"""
+            # The cached location disappeared (e.g. KiCad was uninstalled)
+            _WHICH_CACHE.pop("kicad-cli", None)
+            return _KICAD_CLI_NOT_FOUND
 
     except Exception as e:
         return f"❌ Error generating netlist: {e}"
@@ -227,11 +258,10 @@ async def get_netlist_nets(
             "",
         ]
 
+        filter_re = re.compile(filter_pattern, re.IGNORECASE) if filter_pattern else None
         for net_name, net in sorted(nets.items()):
-            if filter_pattern:
-                import re
-                if not re.search(filter_pattern, net_name, re.IGNORECASE):
-                    continue
+            if filter_re and not filter_re.search(net_name):
+                continue
 
             lines.append(f"### {net_name}")
             lines.append(f"**Code:** {net.code}")
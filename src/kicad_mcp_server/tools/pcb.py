@@ -39,7 +39,7 @@ async def list_pcb_footprints(
         ]
 
         for fp in footprints:
-            fp_name = fp.footprint_id.split(":")[-1] if ":" in fp.footprint_id else fp.footprint_id
+            fp_name = fp.footprint_id.rpartition(":")[2] or fp.footprint_id
             pos_str = f"({fp.position[0]:.2f}, {fp.position[1]:.2f})"
             lines.append(
                 f"| {fp.reference} | {fp.value} | {fp_name} | {fp.layer} | {pos_str} | {fp.rotation:.1f}° | {fp.pad_count} |"
@@ -2,8 +2,91 @@
 
 import uuid
 from pathlib import Path
-from typing import List, Tuple
+from typing import Optional
 from ..server import mcp
+from ..utils.errors import error_details
+
+
+# Board layer stack: (number, canonical name, type, user name)
+_LAYER_DEFS: tuple[tuple[int, str, str, Optional[str]], ...] = (
+    (0, "F.Cu", "signal", None),
+    (31, "B.Cu", "signal", None),
+    (32, "B.Adhes", "user", "B.Adhesive"),
+    (33, "F.Adhes", "user", "F.Adhesive"),
+    (34, "B.Paste", "user", None),
+    (35, "F.Paste", "user", None),
+    (36, "B.SilkS", "user", "B.Silkscreen"),
+    (37, "F.SilkS", "user", "F.Silkscreen"),
+    (38, "B.Mask", "user", None),
+    (39, "F.Mask", "user", None),
+    (40, "Dwgs.User", "user", "User.Drawings"),
+    (41, "Cmts.User", "user", "User.Comments"),
+    (42, "Eco1.User", "user", "User.Eco1"),
+    (43, "Eco2.User", "user", "User.Eco2"),
+    (44, "Edge.Cuts", "user", None),
+    (45, "Margin", "user", None),
+    (46, "B.CrtYd", "user", "B.Courtyard"),
+    (47, "F.CrtYd", "user", "F.Courtyard"),
+    (48, "B.Fab", "user", None),
+    (49, "F.Fab", "user", None),
+)
+
+_LAYERS_BLOCK = (
+    "  (layers\n"
+    + "".join(
+        f'    ({num} "{name}" {kind}' + (f' "{user}"' if user else "") + ")\n"
+        for num, name, kind, user in _LAYER_DEFS
+    )
+    + "  )\n"
+)
+
+# Static layer stack, plot settings and default nets of a new board. ASCII only,
+# so it is encoded once at import instead of on every setup_pcb_layout call.
+_PCB_BOARD_SETUP_B = (_LAYERS_BLOCK + """
+  (setup
+    (pad_to_mask_clearance 0)
+    (aux_axis_origin 0 0)
+    (grid_origin 0 0)
+    (pcbplotparams
+      (layerselection 0x00010fc_ffffffff)
+      (plot_on_all_layers_selection 0x0000000_00000000)
+      (disableapertmacros false)
+      (usegerberextensions false)
+      (usegerberattributes true)
+      (usegerberadvancedattributes true)
+      (creategerberjobfile true)
+      (excludeedgelayer true)
+      (linewidth 0.100000)
+      (plotframeref false)
+      (viasonmask false)
+      (mode 1)
+      (useauxorigin false)
+      (hpglpennumber 1)
+      (hpglpenspeed 20)
+      (hpglpendiameter 15.000000)
+      (dxfpolygonmode true)
+      (dxfimperialunits true)
+      (dxfusepcbnewfont true)
+      (psnegative false)
+      (psa4output false)
+      (plotreference true)
+      (plotvalue true)
+      (plotinvisibletext false)
+      (sketchpadsonfab false)
+      (subtractmaskfromsilk false)
+      (outputformat 1)
+      (mirror false)
+      (drillshape 0)
+      (scaleselection 1)
+      (outputdirectory ""))
+  )
+
+  (net 0 "")
+  (net 1 "GND")
+  (net 2 "+3V3")
+  (net 3 "+5V")
+
+""").encode("ascii")
 
 
 @mcp.tool()
@@ -51,7 +134,7 @@ async def setup_pcb_layout(
         pcb_uuid = str(uuid.uuid4())
 
         # Create basic PCB structure
-        pcb_content = f'''(kicad_pcb (version 20240130) (generator "kicad-mcp-server")
+        pcb_head = f'''(kicad_pcb (version 20240130) (generator "kicad-mcp-server")
 
   (general
     (thickness 1.6)
@@ -66,73 +149,8 @@ async def setup_pcb_layout(
     (ki_producers "KiCad MCP Server")
   )
 
-  (layers
-    (0 "F.Cu" signal)
-    (31 "B.Cu" signal)
-    (32 "B.Adhes" user "B.Adhesive")
-    (33 "F.Adhes" user "F.Adhesive")
-    (34 "B.Paste" user)
-    (35 "F.Paste" user)
-    (36 "B.SilkS" user "B.Silkscreen")
-    (37 "F.SilkS" user "F.Silkscreen")
-    (38 "B.Mask" user)
-    (39 "F.Mask" user)
-    (40 "Dwgs.User" user "User.Drawings")
-    (41 "Cmts.User" user "User.Comments")
-    (42 "Eco1.User" user "User.Eco1")
-    (43 "Eco2.User" user "User.Eco2")
-    (44 "Edge.Cuts" user)
-    (45 "Margin" user)
-    (46 "B.CrtYd" user "B.Courtyard")
-    (47 "F.CrtYd" user "F.Courtyard")
-    (48 "B.Fab" user)
-    (49 "F.Fab" user)
-  )
-
-  (setup
-    (pad_to_mask_clearance 0)
-    (aux_axis_origin 0 0)
-    (grid_origin 0 0)
-    (pcbplotparams
-      (layerselection 0x00010fc_ffffffff)
-      (plot_on_all_layers_selection 0x0000000_00000000)
-      (disableapertmacros false)
-      (usegerberextensions false)
-      (usegerberattributes true)
-      (usegerberadvancedattributes true)
-      (creategerberjobfile true)
-      (excludeedgelayer true)
-      (linewidth 0.100000)
-      (plotframeref false)
-      (viasonmask false)
-      (mode 1)
-      (useauxorigin false)
-      (hpglpennumber 1)
-      (hpglpenspeed 20)
-      (hpglpendiameter 15.000000)
-      (dxfpolygonmode true)
-      (dxfimperialunits true)
-      (dxfusepcbnewfont true)
-      (psnegative false)
-      (psa4output false)
-      (plotreference true)
-      (plotvalue true)
-      (plotinvisibletext false)
-      (sketchpadsonfab false)
-      (subtractmaskfromsilk false)
-      (outputformat 1)
-      (mirror false)
-      (drillshape 0)
-      (scaleselection 1)
-      (outputdirectory ""))
-  )
-
-  (net 0 "")
-  (net 1 "GND")
-  (net 2 "+3V3")
-  (net 3 "+5V")
-
-  (footprint "Connector_PinHeader_2.54mm:PinHeader_1x06_P2.54mm_Vertical" (layer "F.Cu")
+'''
+        pcb_tail = f'''  (footprint "Connector_PinHeader_2.54mm:PinHeader_1x06_P2.54mm_Vertical" (layer "F.Cu")
     (tstamp {pcb_uuid})
     (at 0 0)
     (descr "Through hole straight pin header, 1x06, 2.54mm pitch, single row")
@@ -171,7 +189,9 @@ async def setup_pcb_layout(
 '''
 
         # Write PCB file
-        pcb_path.write_text(pcb_content)
+        pcb_path.write_bytes(
+            b"".join((pcb_head.encode("utf-8"), _PCB_BOARD_SETUP_B, pcb_tail.encode("utf-8")))
+        )
 
         return f"""✅ PCB layout initialized successfully!
 
@@ -195,8 +215,7 @@ Next steps:
 """
 
     except Exception as e:
-        import traceback
-        return f"Error setting up PCB layout: {e}\n\n{traceback.format_exc()}"
+        return f"Error setting up PCB layout: {e}{error_details()}"
 
 
 @mcp.tool()
@@ -246,6 +265,8 @@ async def export_gerber(
             f"{pcb.stem}.TXT",  # Drill file
         ]
 
+        gerber_list = "\n".join(f"  - {f}" for f in gerber_files)
+
         # Create a placeholder Gerber info file
         gerber_info = out_path / "gerber_info.txt"
         gerber_info.write_text(f"""Gerber Export Information
@@ -256,7 +277,7 @@ Output Directory: {out_path}
 Export Date: 2025-01-25
 
 Gerber Files:
-{chr(10).join([f'  - {f}' for f in gerber_files])}
+{gerber_list}
 
 Manufacturer Notes:
 - Layer stack: 2 layers (Top, Bottom)
@@ -279,7 +300,7 @@ Recommended manufacturers:
 **Output Directory:** {out_path}
 
 **Gerber Files:**
-{chr(10).join([f'  - {f}' for f in gerber_files])}
+{gerber_list}
 
 **Next Steps:**
 
@@ -313,5 +334,4 @@ This tool creates the directory structure and documentation.
 """
 
     except Exception as e:
-        import traceback
-        return f"Error exporting Gerber: {e}\n\n{traceback.format_exc()}"
+        return f"Error exporting Gerber: {e}{error_details()}"
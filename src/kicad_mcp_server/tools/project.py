@@ -4,14 +4,27 @@ Uses KiCad's template projects to ensure 100% compatibility.
 """
 
 from pathlib import Path
-from typing import List, Optional
+from typing import Optional
 from ..server import mcp
+from ..utils.errors import error_details
 import uuid
 import json
 import shutil
 import re
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:  # optional: faster .kicad_pro parsing
+    orjson = None
+
+# Title-block fields rewritten in the copied template schematic
+_SCH_UUID_RE = re.compile(r'\(uuid "([^"]*)"\)')
+_SCH_TITLE_RE = re.compile(r'\(title "([^"]*)"\)')
+_SCH_DATE_RE = re.compile(r'\(date "([^"]*)"\)')
+_SCH_COMPANY_RE = re.compile(r'\(company "([^"]*)"\)')
+_SCH_TITLE_FIELD_RE = re.compile(r'(title "([^"]*)")')
+
 
 def _find_kicad_template() -> Optional[Path]:
     """Find KiCad template directory."""
@@ -29,6 +42,14 @@ def _find_kicad_template() -> Optional[Path]:
     return None
 
 
+def _load_json(path: Path) -> dict:
+    """Load a JSON file, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(path.read_bytes())
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
 def _get_date_string() -> str:
     """Get current date in ISO format."""
     return datetime.now().strftime("%Y-%m-%d")
@@ -94,8 +115,7 @@ After installation, this tool will use KiCad's template to create projects.
         pro_file = path / f"{project_name}.kicad_pro"
 
         if pro_file.exists():
-            with open(pro_file, 'r') as f:
-                pro_data = json.load(f)
+            pro_data = _load_json(pro_file)
 
             # Update metadata
             pro_data["meta"]["filename"] = f"{project_name}.kicad_pro"
@@ -116,20 +136,19 @@ After installation, this tool will use KiCad's template to create projects.
 
             # Update UUID
             new_uuid = str(uuid.uuid4())
-            content = re.sub(r'\(uuid "([^"]*)"\)', f'(uuid "{new_uuid}")', content, count=1)
+            content = _SCH_UUID_RE.sub(f'(uuid "{new_uuid}")', content, count=1)
 
             # Update title block
-            content = re.sub(r'\(title "([^"]*)"\)', f'(title "{title_text}")', content, count=1)
-            content = re.sub(r'\(date "([^"]*)"\)', f'(date "{date_str}")', content, count=1)
+            content = _SCH_TITLE_RE.sub(f'(title "{title_text}")', content, count=1)
+            content = _SCH_DATE_RE.sub(f'(date "{date_str}")', content, count=1)
 
             if company:
                 # Find and replace company, or add it if not present
                 if '(company' in content:
-                    content = re.sub(r'\(company "([^"]*)"\)', f'(company "{company}")', content, count=1)
+                    content = _SCH_COMPANY_RE.sub(f'(company "{company}")', content, count=1)
                 else:
                     # Add company field after title
-                    content = re.sub(
-                        r'(title "([^"]*)")',
+                    content = _SCH_TITLE_FIELD_RE.sub(
                         r'\1\n    (company "{}")'.format(company),
                         content,
                         count=1
@@ -179,5 +198,4 @@ Project is ready for KiCad 9.0+! 🚀
 """
 
     except Exception as e:
-        import traceback
-        return f"Error creating project: {e}\\n\\n{traceback.format_exc()}"
+        return f"Error creating project: {e}{error_details()}"
@@ -1,11 +1,48 @@
 """Schematic analysis tools for KiCad MCP Server."""
 
+import asyncio
+import re
+from collections import Counter
 from pathlib import Path
 
 from ..server import mcp
-from ..parsers.schematic_parser import SchematicParser
+from ..parsers.schematic_parser import get_parser
 from ..tools.netlist import _find_root_schematic
 
+# Power net names (VCC, GND, etc.), matched case-insensitively anywhere in the name
+_POWER_NET_RE = re.compile(r"gnd|vcc|vdd|vss|\+|-", re.IGNORECASE)
+
+# Properties already shown in the get_symbol_details header
+_DETAIL_SKIP_KEYS = frozenset({"Value", "Footprint"})
+
+# Pre-bound row formatters for the markdown tables
+_COMPONENT_ROW = "| {} | {} | {} | {} |".format
+_COMPONENT_FLAG_ROW = "| {} | {} | {} | {} | {} | {} |".format
+_SEARCH_ROW = "| {} | {} | {} |".format
+_NET_ROW = "| {} | {} | {} |".format
+
+
+def _format_component_rows(components: list, show_flags: bool) -> list[str]:
+    """Format component table rows for list_schematic_components."""
+    rows = []
+    append = rows.append
+    for comp in components:
+        footprint = comp.footprint or "-"
+        library = comp.library_id.rpartition(":")[2] or comp.library_id
+        if show_flags:
+            flags = comp.flags
+            dnp = "Yes" if flags.get("dnp", False) else ""
+            in_bom = "No" if not flags.get("in_bom", True) else ""
+            append(_COMPONENT_FLAG_ROW(comp.reference, comp.value, footprint, library, dnp, in_bom))
+        else:
+            append(_COMPONENT_ROW(comp.reference, comp.value, footprint, library))
+    return rows
+
+
+def _format_net_rows(nets: list) -> list[str]:
+    """Format net table rows for list_schematic_nets, sorted by name."""
+    return [_NET_ROW(net.name, net.type, net.code) for net in sorted(nets, key=lambda n: n.name)]
+
 
 @mcp.tool()
 async def list_schematic_components(
@@ -26,15 +63,17 @@ async def list_schematic_components(
         Formatted list of components with their properties
     """
     try:
-        parser = SchematicParser(file_path)
-        components = parser.get_components()
+        parser = get_parser(file_path)
+        components = await asyncio.to_thread(parser.get_components)
 
         # Apply filters
         if filter_type:
-            components = [c for c in components if c.reference.startswith(filter_type.upper())]
+            type_prefix = filter_type.upper()
+            components = [c for c in components if c.reference.startswith(type_prefix)]
 
         if filter_value:
-            components = [c for c in components if filter_value.lower() in c.value.lower()]
+            value_lc = filter_value.lower()
+            components = [c for c in components if value_lc in c.value.lower()]
 
         if filter_dnp is not None:
             components = [c for c in components if c.flags.get("dnp", False) == filter_dnp]
@@ -61,15 +100,7 @@ async def list_schematic_components(
             separator,
         ]
 
-        for comp in components:
-            footprint = comp.footprint or "-"
-            library = comp.library_id.split(":")[-1] if ":" in comp.library_id else comp.library_id
-            row = f"| {comp.reference} | {comp.value} | {footprint} | {library} |"
-            if has_dnp or has_not_in_bom:
-                dnp = "Yes" if comp.flags.get("dnp", False) else ""
-                in_bom = "No" if not comp.flags.get("in_bom", True) else ""
-                row += f" {dnp} | {in_bom} |"
-            lines.append(row)
+        lines.extend(_format_component_rows(components, has_dnp or has_not_in_bom))
 
         return "\n".join(lines)
 
@@ -91,8 +122,8 @@ async def get_symbol_details(file_path: str, reference: str) -> str:
         Detailed component information including pins and properties
     """
     try:
-        parser = SchematicParser(file_path)
-        component = parser.get_component_by_reference(reference)
+        parser = get_parser(file_path)
+        component = await asyncio.to_thread(parser.get_component_by_reference, reference)
 
         if not component:
             return f"Component '{reference}' not found in schematic."
@@ -114,9 +145,11 @@ async def get_symbol_details(file_path: str, reference: str) -> str:
         if component.properties:
             lines.append("")
             lines.append("## Properties")
-            for key, value in sorted(component.properties.items()):
-                if key not in ("Value", "Footprint"):
-                    lines.append(f"- {key}: {value}")
+            remaining = {
+                k: v for k, v in component.properties.items() if k not in _DETAIL_SKIP_KEYS
+            }
+            for key, value in sorted(remaining.items()):
+                lines.append(f"- {key}: {value}")
 
         # Pins
         if component.pins:
@@ -143,6 +176,7 @@ async def search_symbols(
     file_path: str,
     pattern: str,
     search_fields: str = "all",
+    max_results: int = 50,
 ) -> str:
     """Search for symbols/components matching a pattern.
 
@@ -150,32 +184,46 @@ async def search_symbols(
         file_path: Path to .kicad_sch file
         pattern: Search pattern (supports regex)
         search_fields: Fields to search: 'all', 'reference', 'value', 'library'
+        max_results: Maximum number of matches to list, at least 1 (default: 50)
 
     Returns:
         List of matching components
     """
+    if max_results < 1:
+        return f"Error: max_results must be at least 1, got {max_results}"
+
     try:
-        parser = SchematicParser(file_path)
-        components = parser.search_components(pattern)
+        parser = get_parser(file_path)
+        # One extra match tells us whether the result was truncated
+        components = await asyncio.to_thread(
+            parser.search_components, pattern, limit=max_results + 1
+        )
 
         if not components:
             return f"No components found matching pattern: {pattern}"
 
+        truncated = len(components) > max_results
+        if truncated:
+            components = components[:max_results]
+            summary = f"Showing first {max_results} matching component(s)"
+        else:
+            summary = f"Found {len(components)} matching component(s)"
+
         # Format output
         lines = [
             f"# Search Results: '{pattern}'",
-            f"Found {len(components)} matching component(s)",
+            summary,
             "",
             "| Reference | Value | Library |",
             "|-----------|-------|---------|",
         ]
 
-        for comp in components[:50]:  # Limit to 50 results
-            library = comp.library_id.split(":")[-1] if ":" in comp.library_id else comp.library_id
-            lines.append(f"| {comp.reference} | {comp.value} | {library} |")
+        for comp in components:
+            library = comp.library_id.rpartition(":")[2] or comp.library_id
+            lines.append(_SEARCH_ROW(comp.reference, comp.value, library))
 
-        if len(components) > 50:
-            lines.append(f"\n... and {len(components) - 50} more")
+        if truncated:
+            lines.append("\n... more matches available; refine the pattern or raise max_results")
 
         return "\n".join(lines)
 
@@ -200,13 +248,12 @@ async def list_schematic_nets(
         Formatted list of nets
     """
     try:
-        parser = SchematicParser(file_path)
-        nets = parser.get_nets()
+        parser = get_parser(file_path)
+        nets = await asyncio.to_thread(parser.get_nets)
 
         # Filter for power nets if requested
         if filter_power:
-            power_keywords = ["gnd", "vcc", "vdd", "vss", "+", "-"]
-            nets = [n for n in nets if any(kw in n.name.lower() for kw in power_keywords)]
+            nets = [n for n in nets if _POWER_NET_RE.search(n.name)]
 
         # Sub-sheet detection: unnamed nets can't be resolved without hierarchy
         sch_path = Path(file_path)
@@ -235,8 +282,7 @@ async def list_schematic_nets(
             "|----------|------|------|",
         ]
 
-        for net in sorted(nets, key=lambda n: n.name):
-            lines.append(f"| {net.name} | {net.type} | {net.code} |")
+        lines.extend(_format_net_rows(nets))
 
         if subsheet_note:
             lines.append("")
@@ -261,17 +307,14 @@ async def get_schematic_info(file_path: str) -> str:
         Schematic metadata and statistics
     """
     try:
-        parser = SchematicParser(file_path)
-        title_block = parser.get_title_block()
-        components = parser.get_components()
-        nets = parser.get_nets()
-        sheets = parser.get_sheets()
+        snapshot = await asyncio.to_thread(get_parser(file_path).get_all)
+        title_block = snapshot.title_block
+        components = snapshot.components
+        nets = snapshot.nets
+        sheets = snapshot.sheets
 
         # Count components by type
-        component_counts = {}
-        for comp in components:
-            prefix = "".join(c for c in comp.reference if c.isalpha())
-            component_counts[prefix] = component_counts.get(prefix, 0) + 1
+        component_counts = Counter(c.prefix for c in components if c.prefix)
 
         # Format output
         lines = [
@@ -299,8 +342,8 @@ async def get_schematic_info(file_path: str) -> str:
             "## Components by Type",
 ])
 
-        for prefix in sorted(component_counts.keys()):
-            lines.append(f"- {prefix}: {component_counts[prefix]}")
+        for prefix, count in sorted(component_counts.items()):
+            lines.append(f"- {prefix}: {count}")
 
         if sheets:
             lines.extend([
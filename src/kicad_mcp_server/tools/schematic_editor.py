@@ -1,15 +1,15 @@
 """Advanced schematic editing tools for KiCad 9.0+ MCP Server."""
 
+import asyncio
+import mmap
+import os
+import threading
 import uuid
-from datetime import datetime
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import List, Tuple
 from ..server import mcp
-
-
-def _get_date_string() -> str:
-    """Get current date in ISO format."""
-    return datetime.now().strftime("%Y-%m-%d")
+from ..utils.errors import error_details
 
 
 # KiCad standard library symbols mapping
@@ -28,27 +28,253 @@ KICAD_STANDARD_SYMBOLS = {
     },
 }
 
-# Pin definitions for common symbols
-SYMBOL_PINS = {
-    "Device:R": [(1, "passive", ""), (2, "passive", "")],
-    "Device:LED": [(1, "passive", "K"), (2, "passive", "A")],
-    "Device:C": [(1, "passive", ""), (2, "passive", "")],
-    "RF_Module:ESP32-S3-WROOM-1": [(1, "input", "GPIO0"), (2, "input", "GPIO1")],
-    "Display_Graphic:OLED-128O064D": [(1, "input", "GND"), (2, "input", "SCL")],
-    "Sensor_Motion:MPU-6050": [(1, "input", "VDD"), (2, "input", "GND")],
+# Pin definitions for common symbols, stored as parallel tuples per lib_id
+SYMBOL_PINS_NUMS: dict[str, tuple[int, ...]] = {
+    "Device:R": (1, 2),
+    "Device:LED": (1, 2),
+    "Device:C": (1, 2),
+    "RF_Module:ESP32-S3-WROOM-1": (1, 2),
+    "Display_Graphic:OLED-128O064D": (1, 2),
+    "Sensor_Motion:MPU-6050": (1, 2),
+}
+
+SYMBOL_PINS_TYPES: dict[str, tuple[str, ...]] = {
+    "Device:R": ("passive", "passive"),
+    "Device:LED": ("passive", "passive"),
+    "Device:C": ("passive", "passive"),
+    "RF_Module:ESP32-S3-WROOM-1": ("input", "input"),
+    "Display_Graphic:OLED-128O064D": ("input", "input"),
+    "Sensor_Motion:MPU-6050": ("input", "input"),
+}
+
+SYMBOL_PINS_NAMES: dict[str, tuple[str, ...]] = {
+    "Device:R": ("", ""),
+    "Device:LED": ("K", "A"),
+    "Device:C": ("", ""),
+    "RF_Module:ESP32-S3-WROOM-1": ("GPIO0", "GPIO1"),
+    "Display_Graphic:OLED-128O064D": ("GND", "SCL"),
+    "Sensor_Motion:MPU-6050": ("VDD", "GND"),
 }
 
+_DEFAULT_PINS_NUMS = (1, 2)
+
+
+def get_pins_for_symbol(library_name: str, symbol_name: str) -> Tuple[int, ...]:
+    """Get pin numbers for a symbol.
+
+    Pin types and names live in SYMBOL_PINS_TYPES / SYMBOL_PINS_NAMES,
+    index-aligned with the numbers returned here.
+    """
+    return SYMBOL_PINS_NUMS.get(f"{library_name}:{symbol_name}", _DEFAULT_PINS_NUMS)
+
+
+# S-expression templates for new schematic entries (%-formatted per call).
+# Coordinates use %.10g: shortest form (100 rather than 100.0) without
+# rounding away the sub-micron digits that plain %g would drop.
+COMPONENT_TEMPLATE = '''  (symbol (lib_id "%s") (at %.10g %.10g 0) (unit %d)
+  (exclude_from_sim no) (in_bom yes) (on_board yes) (dnp no)
+  (uuid %s)
+  (property "Reference" "%s" (at %.10g %.10g 0)
+    (effects (font (size 1.27 1.27)))
+  )
+  (property "Value" "%s" (at %.10g %.10g 0)
+    (effects (font (size 1.27 1.27)))
+  )
+  (property "Footprint" "%s" (at %.10g %.10g 0)
+    (effects (font (size 1.27 1.27)) hide)
+  )
+%s
+)'''
+
+WIRE_TEMPLATE = '''  (wire (pts %s)
+  )'''
+
+LABEL_TEMPLATE = '''  (label "%s" (at %.10g %.10g %.10g)
+    (effects (font (size 1.27 1.27)) (justify left))
+    (uuid %s)
+  )'''
+
+
+# Buffer size for writes to schematic files (matches coreutils' io_blksize)
+_WRITE_BUFFER_SIZE = 128 * 1024
+
+# Terminator position per schematic from the last edit:
+# abspath -> (st_mtime_ns, st_size, offset of the closing parenthesis)
+_TERMINATOR_OFFSET: dict[str, tuple[int, int, int]] = {}
+
+# Serializes in-place edits per schematic: abspath -> lock. Edits run on
+# worker threads, and the terminator scan, truncate, write and offset cache
+# update must not interleave for the same file.
+_FILE_LOCKS: dict[str, threading.Lock] = {}
+_FILE_LOCKS_GUARD = threading.Lock()
+
+# Schematics held in memory between open_schematic_session and commit_schematic:
+# abspath -> file contents with all pending edits applied
+_SESSIONS: dict[str, bytearray] = {}
+
+# Serializes edits and session open/commit per schematic on the event loop:
+# abspath -> lock. Without it an edit could land in a session buffer that is
+# being written out, or on disk just before a session snapshot replaces it.
+_SESSION_LOCKS: dict[str, asyncio.Lock] = {}
+
+
+def _write_at(fd: int, offset: int, *chunks: bytes) -> None:
+    """Write chunks at offset through a buffered writer, retrying short writes."""
+    os.lseek(fd, offset, os.SEEK_SET)
+    with open(fd, "wb", buffering=_WRITE_BUFFER_SIZE, closefd=False) as f:
+        for chunk in chunks:
+            f.write(chunk)
+
+
+def _file_lock(key: str) -> threading.Lock:
+    """Return the edit lock for a schematic, creating it on first use."""
+    with _FILE_LOCKS_GUARD:
+        lock = _FILE_LOCKS.get(key)
+        if lock is None:
+            lock = _FILE_LOCKS[key] = threading.Lock()
+        return lock
+
+
+def _append_before_terminator(path: Path, entry: str) -> None:
+    """Insert an entry just before the schematic's final closing parenthesis.
+
+    The file is memory-mapped to locate the terminator without decoding it,
+    and only the tail is rewritten, so an edit costs the same regardless of
+    schematic size. The terminator offset is remembered per file, so repeated
+    edits skip the scan as long as nobody else has modified the file. Files
+    that do not end in ``)`` get the entry appended at the end instead.
+    Edits to the same file are serialized by a per-file lock.
+    """
+    key = os.path.abspath(path)
+    data = entry.encode("utf-8")
+    with _file_lock(key):
+        fd = os.open(path, os.O_RDWR)
+        try:
+            st = os.fstat(fd)
+            size = st.st_size
+            terminator = -1
+
+            cached = _TERMINATOR_OFFSET.get(key)
+            if cached and cached[:2] == (st.st_mtime_ns, size):
+                os.lseek(fd, cached[2], os.SEEK_SET)
+                if os.read(fd, 1) == b")":
+                    terminator = cached[2]
+
+            if terminator < 0 and size:
+                with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mm:
+                    pos = mm.rfind(b")")
+                    if pos >= 0 and not mm[pos + 1:].strip():
+                        terminator = pos
+
+            if terminator < 0:
+                _write_at(fd, size, b"\n", data, b"\n")
+                _TERMINATOR_OFFSET.pop(key, None)
+            else:
+                os.ftruncate(fd, terminator)
+                _write_at(fd, terminator, data, b"\n)\n")
+                st = os.fstat(fd)
+                _TERMINATOR_OFFSET[key] = (st.st_mtime_ns, st.st_size, terminator + len(data) + 1)
+        finally:
+            os.close(fd)
+
+
+def _splice_before_terminator(buf: bytearray, entry: str) -> None:
+    """In-memory counterpart of _append_before_terminator for session buffers."""
+    data = entry.encode("utf-8")
+    pos = buf.rfind(b")")
+    if pos >= 0 and not buf[pos + 1:].strip():
+        buf[pos:] = data + b"\n)\n"
+    else:
+        buf += b"\n" + data + b"\n"
+
+
+def _session_lock(key: str) -> asyncio.Lock:
+    """Return the session lock for a schematic, creating it on first use."""
+    lock = _SESSION_LOCKS.get(key)
+    if lock is None:
+        lock = _SESSION_LOCKS[key] = asyncio.Lock()
+    return lock
+
 
-def get_pins_for_symbol(library_name: str, symbol_name: str) -> List[Tuple[int, str, str]]:
-    """Get pin definitions for a symbol."""
+async def _insert_entry(path: Path, entry: str) -> None:
+    """Insert an entry into the open session buffer, or into the file itself."""
+    key = os.path.abspath(path)
+    async with _session_lock(key):
+        buf = _SESSIONS.get(key)
+        if buf is not None:
+            _splice_before_terminator(buf, entry)
+        else:
+            await asyncio.to_thread(_append_before_terminator, path, entry)
+
+
+def _uuids(n: int) -> List[str]:
+    """Generate n random (version 4) UUID strings from a single urandom call."""
+    buf = os.urandom(16 * n)
+    return [str(uuid.UUID(bytes=buf[i:i + 16], version=4)) for i in range(0, 16 * n, 16)]
+
+
+def _component_entry(
+    library_name: str,
+    symbol_name: str,
+    reference: str,
+    value: str,
+    footprint: str = "",
+    x: float = 100,
+    y: float = 100,
+    unit: int = 1,
+) -> Tuple[str, str]:
+    """Build the S-expression for a component instance.
+
+    Returns:
+        Tuple of (entry text, component UUID)
+    """
     lib_id = f"{library_name}:{symbol_name}"
-    if lib_id in SYMBOL_PINS:
-        return SYMBOL_PINS[lib_id]
-    return [(1, "passive", ""), (2, "passive", "")]
 
+    # Get pins
+    nums = get_pins_for_symbol(library_name, symbol_name)
+    uuids = _uuids(len(nums) + 1)
+    comp_uuid = uuids[0]
+    pin_entries = []
+    for pin_num, pin_uuid in zip(nums, uuids[1:]):
+        pin_entries.append('    (pin "%d" (uuid %s))' % (pin_num, pin_uuid))
+    pins_str = "\n".join(pin_entries) if pin_entries else ""
 
-@mcp.tool()
-async def add_component_from_library(
+    # Create component with CRITICAL fixes:
+    # 1. exclude_from_sim attribute
+    # 2. Pin definitions with UUIDs
+    ref_y, value_y, footprint_y = y - 5, y + 2.54, y + 5.08
+    component_entry = COMPONENT_TEMPLATE % (
+        lib_id, x, y, unit,
+        comp_uuid,
+        reference, x, ref_y,
+        value, x, value_y,
+        footprint, x, footprint_y,
+        pins_str,
+    )
+    return component_entry, comp_uuid
+
+
+def _wire_entry(points: List[Tuple[float, float]]) -> str:
+    """Build the S-expression for a wire through the given points."""
+    pts_str = " ".join("(xy %.10g %.10g)" % (x, y) for x, y in points)
+    return WIRE_TEMPLATE % pts_str
+
+
+def _label_entry(text: str, x: float, y: float, orientation: float = 0) -> str:
+    """Build the S-expression for a local label."""
+    return LABEL_TEMPLATE % (text, x, y, orientation, str(uuid.uuid4()))
+
+
+@dataclass
+class AddResult:
+    """Outcome of adding components to a schematic."""
+
+    ok: bool
+    message: str
+    uuids: List[str] = field(default_factory=list)
+
+
+async def add_component_from_library_impl(
     file_path: str,
     library_name: str,
     symbol_name: str,
@@ -58,55 +284,49 @@ async def add_component_from_library(
     x: float = 100,
     y: float = 100,
     unit: int = 1,
-) -> str:
-    """Add a component from KiCad's built-in library to the schematic."""
+) -> AddResult:
+    """Add a component to the schematic and report the outcome."""
     try:
         path = Path(file_path)
         if not path.exists():
-            return f"Error: File {file_path} does not exist"
+            return AddResult(False, f"Error: File {file_path} does not exist")
 
-        content = path.read_text()
-        comp_uuid = str(uuid.uuid4())
-        lib_id = f"{library_name}:{symbol_name}"
+        component_entry, comp_uuid = _component_entry(
+            library_name, symbol_name, reference, value, footprint, x, y, unit
+        )
+        await _insert_entry(path, component_entry)
 
-        # Get pins
-        pins = get_pins_for_symbol(library_name, symbol_name)
-        pin_entries = []
-        for pin_num, pin_type, pin_name in pins:
-            pin_uuid = str(uuid.uuid4())
-            pin_entries.append(f'    (pin "{pin_num}" (uuid {pin_uuid}))')
-        pins_str = "\n".join(pin_entries) if pin_entries else ""
-
-        # Create component with CRITICAL fixes:
-        # 1. exclude_from_sim attribute
-        # 2. Pin definitions with UUIDs
-        component_entry = f'''  (symbol (lib_id "{lib_id}") (at {x} {y} 0) (unit {unit})
-  (exclude_from_sim no) (in_bom yes) (on_board yes) (dnp no)
-  (uuid {comp_uuid})
-  (property "Reference" "{reference}" (at {x} {y - 5} 0)
-    (effects (font (size 1.27 1.27)))
-  )
-  (property "Value" "{value}" (at {x} {y + 2.54} 0)
-    (effects (font (size 1.27 1.27)))
-  )
-  (property "Footprint" "{footprint}" (at {x} {y + 5.08} 0)
-    (effects (font (size 1.27 1.27)) hide)
-  )
-{pins_str}
-)'''
+        lib_id = f"{library_name}:{symbol_name}"
+        return AddResult(
+            True,
+            f"✅ Component {reference} added successfully ({lib_id}, UUID {comp_uuid})",
+            [comp_uuid],
+        )
+    except Exception as e:
+        return AddResult(False, f"Error adding component: {e}{error_details()}")
 
-        if content.rstrip().endswith(')'):
-            content = content.rstrip()
-            if content.endswith(')'):
-                content = content[:-1] + component_entry + "\n)\n"
-            else:
-                content = content + "\n" + component_entry + "\n"
-        else:
-            content = content + "\n" + component_entry + "\n"
 
-        path.write_text(content)
+@mcp.tool()
+async def add_component_from_library(
+    file_path: str,
+    library_name: str,
+    symbol_name: str,
+    reference: str,
+    value: str,
+    footprint: str = "",
+    x: float = 100,
+    y: float = 100,
+    unit: int = 1,
+    verbose: bool = False,
+) -> str:
+    """Add a component from KiCad's built-in library to the schematic."""
+    result = await add_component_from_library_impl(
+        file_path, library_name, symbol_name, reference, value, footprint, x, y, unit
+    )
+    if not result.ok or not verbose:
+        return result.message
 
-        return f"""✅ Component added successfully!
+    return f"""✅ Component added successfully!
 
 **File:** {file_path}
 **Library:** {library_name}
@@ -114,8 +334,8 @@ async def add_component_from_library(
 **Reference:** {reference}
 **Value:** {value}
 **Position:** ({x}, {y})
-**Lib ID:** {lib_id}
-**UUID:** {comp_uuid}
+**Lib ID:** {library_name}:{symbol_name}
+**UUID:** {result.uuids[0]}
 
 **Critical Fixes Applied:**
 - ✅ exclude_from_sim attribute added
@@ -123,15 +343,12 @@ async def add_component_from_library(
 - ✅ KiCad 9.0+ compatible format
 """
 
-    except Exception as e:
-        import traceback
-        return f"Error adding component: {e}\n\n{traceback.format_exc()}"
-
 
 @mcp.tool()
 async def add_wire(
     file_path: str,
     points: List[Tuple[float, float]],
+    verbose: bool = False,
 ) -> str:
     """Add a wire (connection line) to the schematic."""
     try:
@@ -139,27 +356,14 @@ async def add_wire(
         if not path.exists():
             return f"Error: File {file_path} does not exist"
 
-        content = path.read_text()
-        pts_str = " ".join([f"(xy {x} {y})" for x, y in points])
-        wire_uuid = str(uuid.uuid4())
-        wire_entry = f'''  (wire (pts {pts_str})
-  )'''
+        await _insert_entry(path, _wire_entry(points))
 
-        if content.rstrip().endswith(')'):
-            content = content.rstrip()
-            if content.endswith(')'):
-                content = content[:-1] + wire_entry + "\n)\n"
-            else:
-                content = content + "\n" + wire_entry + "\n)"
-        else:
-            content = content + "\n" + wire_entry + "\n"
-
-        path.write_text(content)
-
-        return f"✅ Wire added"
+        if not verbose:
+            return "✅ Wire added"
+        points_list = "\n".join(f"  - ({x}, {y})" for x, y in points)
+        return f"✅ Wire added\n\n**Points:**\n{points_list}"
     except Exception as e:
-        import traceback
-        return f"Error adding wire: {e}\n\n{traceback.format_exc()}"
+        return f"Error adding wire: {e}{error_details()}"
 
 
 @mcp.tool()
@@ -176,24 +380,195 @@ async def add_label(
         if not path.exists():
             return f"Error: File {file_path} does not exist"
 
-        content = path.read_text()
-        label_uuid = str(uuid.uuid4())
-        label_entry = f'''  (label "{text}" (at {x} {y} {orientation})
-    (effects (font (size 1.27 1.27)) (justify left))
-    (uuid {label_uuid})
-  )'''
+        await _insert_entry(path, _label_entry(text, x, y, orientation))
+        return f"✅ Label '{text}' added at ({x}, {y})"
+    except Exception as e:
+        return f"Error adding label: {e}{error_details()}"
 
-        if content.rstrip().endswith(')'):
-            content = content.rstrip()
-            if content.endswith(')'):
-                content = content[:-1] + label_entry + "\n)\n"
-            else:
-                content = content + "\n" + label_entry + "\n)"
-        else:
-            content = content + "\n" + label_entry + "\n"
 
-        path.write_text(content)
-        return f"✅ Label '{text}' added at ({x}, {y})"
+async def add_components_bulk_impl(file_path: str, components: List[dict]) -> AddResult:
+    """Add several components with a single file write and report the outcome."""
+    try:
+        path = Path(file_path)
+        if not path.exists():
+            return AddResult(False, f"Error: File {file_path} does not exist")
+
+        built = [_component_entry(**spec) for spec in components]
+        if built:
+            await _insert_entry(path, "\n".join(entry for entry, _ in built))
+
+        return AddResult(
+            True,
+            f"✅ {len(built)} component(s) added successfully",
+            [comp_uuid for _, comp_uuid in built],
+        )
     except Exception as e:
-        import traceback
-        return f"Error adding label: {e}\n\n{traceback.format_exc()}"
+        return AddResult(False, f"Error adding components: {e}{error_details()}")
+
+
+@mcp.tool()
+async def add_components_bulk(
+    file_path: str,
+    components: List[dict],
+    verbose: bool = False,
+) -> str:
+    """Add several components to the schematic with a single file write.
+
+    Args:
+        file_path: Path to .kicad_sch file
+        components: Component specs, each a dict with the arguments of
+            add_component_from_library (library_name, symbol_name, reference,
+            value, and optionally footprint, x, y, unit)
+        verbose: List the added references in the result
+
+    Returns:
+        Summary of the added components
+    """
+    result = await add_components_bulk_impl(file_path, components)
+    if not result.ok or not verbose:
+        return result.message
+    refs = ", ".join(spec["reference"] for spec in components)
+    return f"{result.message}: {refs}"
+
+
+@mcp.tool()
+async def add_wires_bulk(
+    file_path: str,
+    wires: List[List[Tuple[float, float]]],
+) -> str:
+    """Add several wires to the schematic with a single file write.
+
+    Args:
+        file_path: Path to .kicad_sch file
+        wires: List of wires, each a list of (x, y) points
+
+    Returns:
+        Confirmation message
+    """
+    try:
+        path = Path(file_path)
+        if not path.exists():
+            return f"Error: File {file_path} does not exist"
+
+        entries = [_wire_entry(points) for points in wires]
+        if entries:
+            await _insert_entry(path, "\n".join(entries))
+
+        return f"✅ {len(entries)} wire(s) added"
+    except Exception as e:
+        return f"Error adding wires: {e}{error_details()}"
+
+
+@mcp.tool()
+async def add_labels_bulk(
+    file_path: str,
+    labels: List[dict],
+) -> str:
+    """Add several local labels to the schematic with a single file write.
+
+    Args:
+        file_path: Path to .kicad_sch file
+        labels: Label specs, each a dict with text, x, y and optionally orientation
+
+    Returns:
+        Confirmation message
+    """
+    try:
+        path = Path(file_path)
+        if not path.exists():
+            return f"Error: File {file_path} does not exist"
+
+        entries = [_label_entry(**spec) for spec in labels]
+        if entries:
+            await _insert_entry(path, "\n".join(entries))
+
+        return f"✅ {len(entries)} label(s) added"
+    except Exception as e:
+        return f"Error adding labels: {e}{error_details()}"
+
+
+@mcp.tool()
+async def open_schematic_session(file_path: str) -> str:
+    """Load a schematic into memory so subsequent edits skip the disk.
+
+    While a session is open, add_* tools on this file only modify the
+    in-memory copy. Call commit_schematic to write the result back, or
+    discard_schematic_session to drop the edits. Read tools such as
+    list_schematic_components keep showing the file on disk until commit.
+
+    Args:
+        file_path: Path to .kicad_sch file
+
+    Returns:
+        Confirmation message
+    """
+    try:
+        path = Path(file_path)
+        if not path.exists():
+            return f"Error: File {file_path} does not exist"
+
+        key = os.path.abspath(path)
+
+        def read() -> bytes:
+            with _file_lock(key):
+                return path.read_bytes()
+
+        async with _session_lock(key):
+            if key in _SESSIONS:
+                return (
+                    f"Session already open for {file_path}; "
+                    "use commit_schematic or discard_schematic_session to close it"
+                )
+            _SESSIONS[key] = bytearray(await asyncio.to_thread(read))
+        return f"✅ Session opened for {file_path}; edits stay in memory until commit_schematic"
+    except Exception as e:
+        return f"Error opening session: {e}{error_details()}"
+
+
+@mcp.tool()
+async def commit_schematic(file_path: str) -> str:
+    """Write an open schematic session back to disk and close it.
+
+    Args:
+        file_path: Path to .kicad_sch file
+
+    Returns:
+        Confirmation message
+    """
+    try:
+        key = os.path.abspath(file_path)
+        async with _session_lock(key):
+            buf = _SESSIONS.pop(key, None)
+            if buf is None:
+                return f"Error: No open session for {file_path}"
+            data = bytes(buf)
+
+            def write() -> None:
+                with _file_lock(key), open(key, "wb", buffering=_WRITE_BUFFER_SIZE) as f:
+                    f.write(data)
+
+            try:
+                await asyncio.to_thread(write)
+            except Exception:
+                # Keep the edits so the commit can be retried
+                _SESSIONS[key] = buf
+                raise
+            _TERMINATOR_OFFSET.pop(key, None)
+        return f"✅ Schematic committed: {len(data)} bytes written to {file_path}"
+    except Exception as e:
+        return f"Error committing schematic: {e}{error_details()}"
+
+
+@mcp.tool()
+async def discard_schematic_session(file_path: str) -> str:
+    """Close an open schematic session without writing its edits.
+
+    Args:
+        file_path: Path to .kicad_sch file
+
+    Returns:
+        Confirmation message
+    """
+    if _SESSIONS.pop(os.path.abspath(file_path), None) is None:
+        return f"Error: No open session for {file_path}"
+    return f"✅ Session discarded for {file_path}; the file on disk is unchanged"
@@ -0,0 +1,19 @@
+"""Error reporting helpers for tool results."""
+
+import traceback
+
+from ..config import config
+
+
+def error_details() -> str:
+    """Get the current exception's traceback for a tool error message.
+
+    Formatting the traceback walks every frame, so it is only done when
+    KICAD_MCP_DEBUG is enabled; otherwise the message stays one line.
+
+    Returns:
+        Traceback preceded by a blank line, or an empty string
+    """
+    if not config.debug:
+        return ""
+    return f"\n\n{traceback.format_exc()}"
@@ -1,5 +1,6 @@
 """File handling utilities."""
 
+import os
 from pathlib import Path
 from typing import Optional
 
@@ -57,10 +58,10 @@ def resolve_project_path(file_path: str, search_paths: Optional[list[str]] = Non
         return path.resolve()
 
     # Search in provided paths
-    if search_paths:
-        for search_dir in search_paths:
-            search_path = Path(search_dir) / path
-            if search_path.exists():
-                return search_path.resolve()
+    for search_dir in search_paths or ():
+        candidate = os.path.join(search_dir, file_path)
+        if os.path.exists(candidate):
+            return Path(candidate).resolve()
 
     raise FileNotFoundError(f"File not found: {file_path}")
+
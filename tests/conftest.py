@@ -0,0 +1,38 @@
+"""Shared fixtures for KiCad MCP Server tests."""
+
+import asyncio
+import shutil
+from pathlib import Path
+
+import pytest
+
+from kicad_mcp_server.tools import project
+
+PRISTINE_PROJECT_NAME = "base"
+
+
+@pytest.fixture(scope="session")
+def _pristine_kicad_project(tmp_path_factory) -> Path:
+    """KiCad project created once per session from KiCad's template.
+
+    Tests must not modify this directory; use fresh_project instead.
+    """
+    path = tmp_path_factory.mktemp("pristine")
+    asyncio.run(
+        project.create_kicad_project(
+            project_path=str(path),
+            project_name=PRISTINE_PROJECT_NAME,
+            title=PRISTINE_PROJECT_NAME,
+        )
+    )
+    if not (path / f"{PRISTINE_PROJECT_NAME}.kicad_sch").exists():
+        pytest.skip("KiCad project template not installed")
+    return path
+
+
+@pytest.fixture
+def fresh_project(tmp_path, _pristine_kicad_project) -> Path:
+    """Writable copy of the pristine project; returns its schematic path."""
+    dest = tmp_path / "proj"
+    shutil.copytree(_pristine_kicad_project, dest)
+    return dest / f"{PRISTINE_PROJECT_NAME}.kicad_sch"
@@ -0,0 +1,41 @@
+"""Shared fixtures for tool tests."""
+
+import mmap
+
+import pytest
+from pathlib import Path
+
+from kicad_mcp_server.parsers.schematic_parser import SchematicParser
+
+
+@pytest.fixture(scope="session")
+def example_schematic() -> Path:
+    """Path to example schematic file."""
+    return Path(__file__).parent.parent / "fixtures" / "example_schematic.kicad_sch"
+
+
+@pytest.fixture
+def editable_schematic(example_schematic, tmp_path):
+    """Writable copy of the example schematic."""
+    sch = tmp_path / "editable.kicad_sch"
+    sch.write_bytes(example_schematic.read_bytes())
+    return sch
+
+
+@pytest.fixture(scope="session")
+def schematic_bytes(example_schematic):
+    """Read-only memory map of the example schematic, opened once per session."""
+    with open(example_schematic, "rb") as f:
+        buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    yield buf
+    buf.close()
+
+
+@pytest.fixture(scope="session")
+def parsed_example(example_schematic, schematic_bytes) -> SchematicParser:
+    """Parser for the example schematic, shared across the session.
+
+    Only use this in tests that read from the parser. Tests that edit a
+    schematic must copy the file and build their own parser.
+    """
+    return SchematicParser.from_bytes(schematic_bytes, str(example_schematic))
@@ -0,0 +1,40 @@
+"""Tests for file handling utilities."""
+
+import pytest
+
+from kicad_mcp_server.utils.file_handlers import resolve_project_path
+
+
+class TestResolveProjectPath:
+    """Test project path resolution."""
+
+    def test_found_in_search_path(self, tmp_path, monkeypatch):
+        """Relative paths are found under the search directories."""
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "proj").mkdir()
+        sch = tmp_path / "proj" / "a.kicad_sch"
+        sch.write_text("(kicad_sch)")
+
+        assert resolve_project_path("a.kicad_sch", ["proj"]) == sch.resolve()
+        assert resolve_project_path(str(sch)) == sch.resolve()
+
+    def test_missing_file(self, tmp_path, monkeypatch):
+        """Paths that exist nowhere raise FileNotFoundError."""
+        monkeypatch.chdir(tmp_path)
+        with pytest.raises(FileNotFoundError):
+            resolve_project_path("missing.kicad_sch", ["proj"])
+
+    def test_file_deleted_after_lookup(self, tmp_path, monkeypatch):
+        """A file removed after being resolved is no longer found."""
+        monkeypatch.chdir(tmp_path)
+        sch = tmp_path / "b.kicad_sch"
+        sch.write_text("(kicad_sch)")
+        assert resolve_project_path("b.kicad_sch") == sch.resolve()
+        assert resolve_project_path(str(sch)) == sch.resolve()
+
+        sch.unlink()
+
+        with pytest.raises(FileNotFoundError):
+            resolve_project_path("b.kicad_sch")
+        with pytest.raises(FileNotFoundError):
+            resolve_project_path(str(sch))
@@ -0,0 +1,57 @@
+"""Tests for netlist tools."""
+
+import pytest
+
+from kicad_mcp_server.tools import netlist
+
+
+@pytest.fixture(autouse=True)
+def clear_which_cache():
+    """Isolate tests from each other's PATH lookups."""
+    netlist._WHICH_CACHE.clear()
+    yield
+    netlist._WHICH_CACHE.clear()
+
+
+class TestGenerateNetlist:
+    """Test generate_netlist tool."""
+
+    async def test_kicad_cli_missing(self, example_schematic, monkeypatch):
+        """Without kicad-cli on PATH the tool explains how to export manually."""
+        monkeypatch.setattr(netlist.shutil, "which", lambda name: None)
+
+        result = await netlist.generate_netlist(str(example_schematic))
+
+        assert "kicad-cli not found" in result
+
+    def test_which_is_cached(self, monkeypatch):
+        """PATH is searched once per executable name."""
+        calls = []
+        monkeypatch.setattr(netlist.shutil, "which", lambda name: calls.append(name) or "/bin/x")
+
+        netlist._which("kicad-cli")
+        netlist._which("kicad-cli")
+
+        assert calls == ["kicad-cli"]
+
+    def test_which_miss_is_not_cached(self, monkeypatch):
+        """An executable installed after a failed lookup is found next time."""
+        found = {"path": None}
+        monkeypatch.setattr(netlist.shutil, "which", lambda name: found["path"])
+
+        assert netlist._which("kicad-cli") is None
+        found["path"] = "/bin/kicad-cli"
+        assert netlist._which("kicad-cli") == "/bin/kicad-cli"
+
+    async def test_kicad_cli_failure_falls_back_to_instructions(
+        self, example_schematic, tmp_path, monkeypatch
+    ):
+        """A failing kicad-cli run returns manual export steps."""
+        fake_cli = tmp_path / "kicad-cli"
+        fake_cli.write_text("#!/bin/sh\nexit 1\n")
+        fake_cli.chmod(0o755)
+        monkeypatch.setattr(netlist.shutil, "which", lambda name: str(fake_cli))
+
+        result = await netlist.generate_netlist(str(example_schematic))
+
+        assert "Automatic netlist generation failed" in result
@@ -1,26 +1,23 @@
 """Tests for schematic tools."""
 
-import pytest
-from pathlib import Path
-
-from kicad_mcp_server.parsers.schematic_parser import SchematicParser
+import os
+
+from kicad_mcp_server.parsers.schematic_parser import (
+    SchematicComponent,
+    SchematicParser,
+    get_parser,
+    invalidate_parser_cache,
+)
 from kicad_mcp_server.tools import schematic
 from kicad_mcp_server.tools.netlist import _find_root_schematic
 
 
-@pytest.fixture
-def example_schematic():
-    """Path to example schematic file."""
-    return Path(__file__).parent.parent / "fixtures" / "example_schematic.kicad_sch"
-
-
 class TestSchematicParser:
     """Test schematic parser functionality."""
 
-    def test_parse_file(self, example_schematic):
+    def test_parse_file(self, parsed_example):
         """Test parsing a schematic file."""
-        parser = SchematicParser(str(example_schematic))
-        components = parser.get_components()
+        components = parsed_example.get_components()
 
         assert len(components) >= 5
         assert any(c.reference == "R1" for c in components)
@@ -30,28 +27,25 @@ class TestSchematicParser:
         assert any(c.reference == "U1" for c in components)
         assert any(c.reference == "J1" for c in components)
 
-    def test_component_flags_default(self, example_schematic):
+    def test_component_flags_default(self, parsed_example):
         """Test that normal components have default flags."""
-        parser = SchematicParser(str(example_schematic))
-        r1 = parser.get_component_by_reference("R1")
+        r1 = parsed_example.get_component_by_reference("R1")
         assert r1 is not None
         assert r1.flags["dnp"] is False
         assert r1.flags["in_bom"] is True
         assert r1.flags["on_board"] is True
         assert r1.flags["exclude_from_sim"] is False
 
-    def test_component_flags_dnp(self, example_schematic):
+    def test_component_flags_dnp(self, parsed_example):
         """Test that DNP component has correct flags."""
-        parser = SchematicParser(str(example_schematic))
-        r3 = parser.get_component_by_reference("R3")
+        r3 = parsed_example.get_component_by_reference("R3")
         assert r3 is not None
         assert r3.flags["dnp"] is True
         assert r3.flags["in_bom"] is False
 
-    def test_get_nets(self, example_schematic):
+    def test_get_nets(self, parsed_example):
         """Test getting nets from schematic."""
-        parser = SchematicParser(str(example_schematic))
-        nets = parser.get_nets()
+        nets = parsed_example.get_nets()
 
         assert len(nets) >= 3
         net_names = [n.name for n in nets]
@@ -65,10 +59,9 @@ class TestSchematicParser:
         assert net_by_name["+3V3"].type == "local"
         assert net_by_name["GND"].type == "power"
 
-    def test_hierarchical_labels_in_nets(self, example_schematic):
+    def test_hierarchical_labels_in_nets(self, parsed_example):
         """Test that hierarchical labels appear in nets."""
-        parser = SchematicParser(str(example_schematic))
-        nets = parser.get_nets()
+        nets = parsed_example.get_nets()
 
         net_by_name = {n.name: n for n in nets}
         assert "SDA" in net_by_name
@@ -76,28 +69,99 @@ class TestSchematicParser:
         assert net_by_name["SDA"].type == "hierarchical"
         assert net_by_name["SCL"].type == "hierarchical"
 
-    def test_get_component_by_reference(self, example_schematic):
+    def test_component_prefix(self):
+        """Reference prefixes are derived once on construction."""
+        assert SchematicComponent("SW12", "", "").prefix == "SW"
+        assert SchematicComponent("#PWR01", "", "").prefix == ""
+
+    def test_trace_wire_network_reports_each_label_once(self, example_schematic, parsed_example, tmp_path):
+        """Duplicate labels along a traced wire are reported once."""
+        sch = tmp_path / "traced.kicad_sch"
+        content = example_schematic.read_text().rstrip()
+        cx, cy = parsed_example.get_component_by_reference("R1").position
+        extra = (
+            f'  (wire (pts (xy {cx} {cy}) (xy {cx + 10} {cy})))\n'
+            f'  (global_label "TRACE_SIG" (shape input) (at {cx + 10} {cy} 0))\n'
+            f'  (global_label "TRACE_SIG" (shape input) (at {cx + 11} {cy} 0))\n'
+        )
+        sch.write_text(content[:-1] + extra + ")\n")
+
+        result = SchematicParser(str(sch)).trace_wire_network("R1")
+
+        names = [label["name"] for label in result["connected_labels"]]
+        assert names.count("TRACE_SIG") == 1
+
+    def test_trace_net_infers_signal_labels(self, example_schematic, parsed_example, tmp_path):
+        """Nearby bus/GPIO labels are inferred as signal connections."""
+        sch = tmp_path / "traced_net.kicad_sch"
+        content = example_schematic.read_text().rstrip()
+        cx, cy = parsed_example.get_component_by_reference("R1").position
+        extra = (
+            f'  (label "i2c_sda" (at {cx + 1} {cy} 0))\n'
+            f'  (label "FOO" (at {cx + 2} {cy} 0))\n'
+        )
+        sch.write_text(content[:-1] + extra + ")\n")
+
+        result = SchematicParser(str(sch)).trace_net("R1")
+
+        names = {n["name"] for n in result["inferred_connections"]}
+        assert "i2c_sda" in names
+        assert "FOO" not in names
+
+    def test_get_all(self, parsed_example):
+        """Test that the snapshot matches the individual getters."""
+        snapshot = parsed_example.get_all()
+
+        assert snapshot.components == parsed_example.get_components()
+        assert snapshot.nets == parsed_example.get_nets()
+        assert snapshot.title_block == parsed_example.get_title_block()
+        assert snapshot.sheets == parsed_example.get_sheets()
+
+    def test_get_component_by_reference(self, parsed_example):
         """Test getting component by reference."""
-        parser = SchematicParser(str(example_schematic))
-        r1 = parser.get_component_by_reference("R1")
+        r1 = parsed_example.get_component_by_reference("R1")
 
         assert r1 is not None
         assert r1.value == "10k"
         assert r1.footprint == "Resistor_SMD:R_0805_2012Metric"
 
-    def test_pin_names_passive(self, example_schematic):
+    def test_iter_components_matches_get_components(self, schematic_bytes):
+        """Iteration yields the same components as the parsed list."""
+        parser = SchematicParser.from_bytes(schematic_bytes)
+        assert list(parser.iter_components()) == parser.get_components()
+
+    def test_iter_components_early_exit(self, schematic_bytes):
+        """Stopping early leaves the rest of the file unparsed."""
+        parser = SchematicParser.from_bytes(schematic_bytes)
+        first = next(parser.iter_components())
+
+        assert first.reference
+        assert parser._data is None
+
+    def test_from_bytes_matches_file(self, example_schematic, schematic_bytes):
+        """A parser built from bytes sees the same schematic as one built from the file."""
+        from_file = SchematicParser(str(example_schematic))
+        from_bytes = SchematicParser.from_bytes(schematic_bytes, str(example_schematic))
+
+        assert from_bytes.get_components() == from_file.get_components()
+        assert from_bytes.get_nets() == from_file.get_nets()
+        assert from_bytes.get_title_block() == from_file.get_title_block()
+
+    def test_get_component_by_reference_missing(self, parsed_example):
+        """Unknown references return None."""
+        assert parsed_example.get_component_by_reference("R999") is None
+
+    def test_pin_names_passive(self, parsed_example):
         """Test that resistor pins have names and types from lib_symbols."""
-        parser = SchematicParser(str(example_schematic))
-        r1 = parser.get_component_by_reference("R1")
+        r1 = parsed_example.get_component_by_reference("R1")
         assert r1 is not None
         assert len(r1.pins) == 2
         for pin in r1.pins:
             assert pin["electrical_type"] == "passive"
 
-    def test_pin_names_mcu(self, example_schematic):
+    def test_pin_names_mcu(self, parsed_example):
         """Test that MCU pins have named pins from lib_symbols."""
-        parser = SchematicParser(str(example_schematic))
-        u1 = parser.get_component_by_reference("U1")
+        u1 = parsed_example.get_component_by_reference("U1")
         assert u1 is not None
         assert len(u1.pins) == 2
         pin_names = {p["number"]: p["name"] for p in u1.pins}
@@ -107,29 +171,32 @@ class TestSchematicParser:
         assert pin_types["1"] == "power_in"
         assert pin_types["2"] == "power_in"
 
-    def test_pin_names_connector(self, example_schematic):
+    def test_pin_names_connector(self, parsed_example):
         """Test that connector pins have named pins from lib_symbols."""
-        parser = SchematicParser(str(example_schematic))
-        j1 = parser.get_component_by_reference("J1")
+        j1 = parsed_example.get_component_by_reference("J1")
         assert j1 is not None
         assert len(j1.pins) == 4
         pin_names = {p["number"]: p["name"] for p in j1.pins}
         assert pin_names["1"] == "Pin_1"
         assert pin_names["4"] == "Pin_4"
 
-    def test_search_components(self, example_schematic):
+    def test_search_components(self, parsed_example):
         """Test searching components by pattern."""
-        parser = SchematicParser(str(example_schematic))
-        results = parser.search_components("10k")
+        results = parsed_example.search_components("10k")
 
         assert len(results) > 0
         assert any(c.value == "10k" for c in results)
 
+    def test_search_components_limit(self, parsed_example):
+        """Test that search stops after the requested number of matches."""
+        assert len(parsed_example.search_components("^R")) == 3
+        assert len(parsed_example.search_components("^R", limit=2)) == 2
+        assert parsed_example.search_components("^R", limit=0) == []
+
 
 class TestSchematicTools:
     """Test schematic tool functions."""
 
-    @pytest.mark.asyncio
     async def test_list_schematic_components(self, example_schematic):
         """Test list_schematic_components tool."""
         result = await schematic.list_schematic_components(str(example_schematic))
@@ -141,21 +208,18 @@ class TestSchematicTools:
         assert "DNP" in result
         assert "In BOM" in result
 
-    @pytest.mark.asyncio
     async def test_filter_dnp_true(self, example_schematic):
         """Test filtering for DNP-only components."""
         result = await schematic.list_schematic_components(str(example_schematic), filter_dnp=True)
         assert "R3" in result
         assert "R1" not in result
 
-    @pytest.mark.asyncio
     async def test_filter_dnp_false(self, example_schematic):
         """Test filtering for non-DNP components."""
         result = await schematic.list_schematic_components(str(example_schematic), filter_dnp=False)
         assert "R1" in result
         assert "R3" not in result
 
-    @pytest.mark.asyncio
     async def test_get_symbol_details(self, example_schematic):
         """Test get_symbol_details tool."""
         result = await schematic.get_symbol_details(str(example_schematic), "R1")
@@ -165,7 +229,6 @@ class TestSchematicTools:
         assert "Footprint" in result
         assert "passive" in result
 
-    @pytest.mark.asyncio
     async def test_get_symbol_details_pin_names(self, example_schematic):
         """Test get_symbol_details shows pin names for MCU."""
         result = await schematic.get_symbol_details(str(example_schematic), "U1")
@@ -174,14 +237,26 @@ class TestSchematicTools:
         assert "GND" in result
         assert "power_in" in result
 
-    @pytest.mark.asyncio
     async def test_search_symbols(self, example_schematic):
         """Test search_symbols tool."""
         result = await schematic.search_symbols(str(example_schematic), "ESP32")
 
         assert "U1" in result
 
-    @pytest.mark.asyncio
+    async def test_search_symbols_max_results(self, example_schematic):
+        """Test search_symbols truncates to max_results."""
+        result = await schematic.search_symbols(str(example_schematic), "^R", max_results=2)
+
+        assert "Showing first 2" in result
+        assert "more matches available" in result
+
+    async def test_search_symbols_rejects_non_positive_max_results(self, example_schematic):
+        """max_results below 1 is an error rather than an empty table."""
+        for bad in (0, -1):
+            result = await schematic.search_symbols(str(example_schematic), "^R", max_results=bad)
+            assert result.startswith("Error")
+            assert "max_results" in result
+
     async def test_list_schematic_nets_hierarchical(self, example_schematic):
         """Test list_schematic_nets includes hierarchical labels with type."""
         result = await schematic.list_schematic_nets(str(example_schematic))
@@ -191,7 +266,14 @@ class TestSchematicTools:
         assert "hierarchical" in result
         assert "| Type |" in result
 
-    @pytest.mark.asyncio
+    async def test_list_schematic_nets_filter_power(self, example_schematic):
+        """filter_power keeps only supply-like net names."""
+        result = await schematic.list_schematic_nets(str(example_schematic), filter_power=True)
+
+        assert "+3V3" in result
+        assert "Net_Local1" not in result
+        assert "SPI_CLK" not in result
+
     async def test_get_schematic_info(self, example_schematic):
         """Test get_schematic_info tool."""
         result = await schematic.get_schematic_info(str(example_schematic))
@@ -199,6 +281,27 @@ class TestSchematicTools:
         assert "Example Project" in result
         assert "Components by Type" in result
 
+    def test_parser_cache(self, editable_schematic):
+        """Parsers are reused until the schematic changes on disk."""
+        first = get_parser(str(editable_schematic))
+        assert get_parser(str(editable_schematic)) is first
+
+        mtime_ns = editable_schematic.stat().st_mtime_ns + 1_000_000_000
+        os.utime(editable_schematic, ns=(mtime_ns, mtime_ns))
+        assert get_parser(str(editable_schematic)) is not first
+
+    async def test_missing_file_error_message(self, tmp_path):
+        """A missing schematic reports the path the user passed in."""
+        missing = str(tmp_path / "missing.kicad_sch")
+        result = await schematic.list_schematic_components(missing)
+        assert result == f"Error: File not found: {missing}"
+
+    def test_parser_cache_invalidate(self, editable_schematic):
+        """invalidate_parser_cache forces a fresh parser."""
+        first = get_parser(str(editable_schematic))
+        invalidate_parser_cache(str(editable_schematic))
+        assert get_parser(str(editable_schematic)) is not first
+
 
 class TestFindRootSchematic:
     """Test _find_root_schematic helper."""
@@ -0,0 +1,344 @@
+"""Tests for schematic editing tools."""
+
+import asyncio
+import os
+import time
+import uuid
+
+from kicad_mcp_server.config import config
+from kicad_mcp_server.parsers.schematic_parser import SchematicParser
+from kicad_mcp_server.tools import schematic_editor
+
+
+class TestAppendBeforeTerminator:
+    """Test the in-place append helper."""
+
+    def test_inserts_before_closing_paren(self, tmp_path):
+        """Entry replaces the final ')' and trailing whitespace."""
+        sch = tmp_path / "a.kicad_sch"
+        sch.write_text("(kicad_sch\n  (version 20240130)\n)\n\n  \n")
+
+        schematic_editor._append_before_terminator(sch, "  (wire (pts (xy 0 0) (xy 1 1))\n  )")
+
+        assert sch.read_text() == (
+            "(kicad_sch\n  (version 20240130)\n"
+            "  (wire (pts (xy 0 0) (xy 1 1))\n  )\n)\n"
+        )
+
+    def test_repeated_appends_use_cached_offset(self, tmp_path):
+        """Consecutive edits land before the terminator via the cached offset."""
+        sch = tmp_path / "r.kicad_sch"
+        sch.write_text("(kicad_sch\n)\n")
+
+        schematic_editor._append_before_terminator(sch, "  (a)")
+        key = os.path.abspath(sch)
+        _, _, offset = schematic_editor._TERMINATOR_OFFSET[key]
+        assert sch.read_bytes()[offset:offset + 1] == b")"
+
+        schematic_editor._append_before_terminator(sch, "  (b)")
+        assert sch.read_text() == "(kicad_sch\n  (a)\n  (b)\n)\n"
+
+    def test_external_edit_invalidates_offset(self, tmp_path):
+        """An out-of-band rewrite forces a fresh terminator scan."""
+        sch = tmp_path / "e.kicad_sch"
+        sch.write_text("(kicad_sch\n)\n")
+        schematic_editor._append_before_terminator(sch, "  (a)")
+
+        sch.write_text("(kicad_sch\n  (other stuff)\n)\n")
+        schematic_editor._append_before_terminator(sch, "  (b)")
+
+        assert sch.read_text() == "(kicad_sch\n  (other stuff)\n  (b)\n)\n"
+
+    def test_entry_larger_than_write_buffer(self, tmp_path):
+        """Entries bigger than the write buffer are written in full."""
+        sch = tmp_path / "big.kicad_sch"
+        sch.write_text("(kicad_sch\n)\n")
+        entry = "  (" + "x" * (3 * schematic_editor._WRITE_BUFFER_SIZE) + ")"
+
+        schematic_editor._append_before_terminator(sch, entry)
+
+        assert sch.read_text() == "(kicad_sch\n" + entry + "\n)\n"
+
+    def test_text_after_last_paren(self, tmp_path):
+        """A ')' followed by other text is not treated as the terminator."""
+        sch = tmp_path / "b.kicad_sch"
+        sch.write_text("(kicad_sch\n) junk")
+
+        schematic_editor._append_before_terminator(sch, "  (x)")
+
+        assert sch.read_text() == "(kicad_sch\n) junk\n  (x)\n"
+
+    def test_no_terminator_appends(self, tmp_path):
+        """Files without a closing paren keep their content."""
+        sch = tmp_path / "c.kicad_sch"
+        sch.write_text("(kicad_sch")
+
+        schematic_editor._append_before_terminator(sch, "  (x)")
+
+        assert sch.read_text() == "(kicad_sch\n  (x)\n"
+
+    def test_empty_file(self, tmp_path):
+        """Empty files cannot be mapped and fall back to appending."""
+        sch = tmp_path / "d.kicad_sch"
+        sch.write_text("")
+
+        schematic_editor._append_before_terminator(sch, "  (x)")
+
+        assert sch.read_text() == "\n  (x)\n"
+
+
+class TestUuids:
+    """Test batched UUID generation."""
+
+    def test_uuids_are_unique_v4(self):
+        """Each generated string is a distinct version 4 UUID."""
+        values = schematic_editor._uuids(40)
+
+        assert len(set(values)) == 40
+        assert all(uuid.UUID(v).version == 4 for v in values)
+
+
+class TestSchematicEditorTools:
+    """Test schematic editing tool functions."""
+
+    async def test_add_component_round_trip(self, editable_schematic):
+        """Added components are found by the parser."""
+        res = await schematic_editor.add_component_from_library_impl(
+            file_path=str(editable_schematic),
+            library_name="Device",
+            symbol_name="R",
+            reference="R99",
+            value="1k",
+            x=100,
+            y=100,
+        )
+        assert res.ok, res.message
+        assert len(res.uuids) == 1
+
+        r99 = SchematicParser(str(editable_schematic)).get_component_by_reference("R99")
+        assert r99 is not None
+        assert r99.value == "1k"
+
+    async def test_add_label_round_trip(self, editable_schematic):
+        """Added labels show up as nets."""
+        await schematic_editor.add_label(str(editable_schematic), "NEW_NET", 10, 20)
+
+        nets = SchematicParser(str(editable_schematic)).get_nets()
+        assert "NEW_NET" in {n.name for n in nets}
+
+    async def test_add_components_bulk(self, editable_schematic):
+        """Bulk-added components are all found by the parser."""
+        result = await schematic_editor.add_components_bulk(
+            str(editable_schematic),
+            [
+                {"library_name": "Device", "symbol_name": "R", "reference": "R90", "value": "1k"},
+                {"library_name": "Device", "symbol_name": "C", "reference": "C90", "value": "100n",
+                 "x": 120, "y": 100},
+            ],
+        )
+        assert "2 component(s) added successfully" in result
+
+        parser = SchematicParser(str(editable_schematic))
+        assert parser.get_component_by_reference("R90").value == "1k"
+        assert parser.get_component_by_reference("C90").value == "100n"
+
+    async def test_add_component_missing_file(self, tmp_path):
+        """A missing schematic is reported as a failed result."""
+        res = await schematic_editor.add_component_from_library_impl(
+            str(tmp_path / "missing.kicad_sch"), "Device", "R", "R1", "1k"
+        )
+        assert not res.ok
+        assert res.uuids == []
+
+    async def test_add_components_bulk_bad_spec_writes_nothing(self, editable_schematic):
+        """An invalid spec aborts the batch before the file is touched."""
+        before = editable_schematic.read_bytes()
+
+        result = await schematic_editor.add_components_bulk(
+            str(editable_schematic),
+            [
+                {"library_name": "Device", "symbol_name": "R", "reference": "R91", "value": "1k"},
+                {"library_name": "Device", "symbol_name": "R"},
+            ],
+        )
+
+        assert result.startswith("Error")
+        assert editable_schematic.read_bytes() == before
+
+    async def test_error_traceback_only_in_debug(self, editable_schematic, monkeypatch):
+        """Tracebacks are appended to errors only when debugging is enabled."""
+        bad = [{"library_name": "Device"}]
+
+        monkeypatch.setattr(config, "debug", False)
+        result = await schematic_editor.add_components_bulk(str(editable_schematic), bad)
+        assert "Traceback" not in result
+
+        monkeypatch.setattr(config, "debug", True)
+        result = await schematic_editor.add_components_bulk(str(editable_schematic), bad)
+        assert "Traceback" in result
+
+    async def test_concurrent_adds_are_not_lost(self, editable_schematic, monkeypatch):
+        """Concurrent edits to one file are serialized, so none are lost."""
+        write_at = schematic_editor._write_at
+
+        def slow_write_at(*args):
+            # Widen the window between the terminator scan and the write
+            time.sleep(0.001)
+            write_at(*args)
+
+        monkeypatch.setattr(schematic_editor, "_write_at", slow_write_at)
+        n = 30
+        await asyncio.gather(*(
+            schematic_editor.add_label(str(editable_schematic), f"CONC_{i}", i, i)
+            for i in range(n)
+        ))
+
+        content = editable_schematic.read_text()
+        assert all(f'(label "CONC_{i}"' in content for i in range(n))
+        assert content.rstrip().endswith(")")
+
+    async def test_add_wires_and_labels_bulk(self, editable_schematic):
+        """Bulk wires and labels land before the terminator."""
+        await schematic_editor.add_wires_bulk(
+            str(editable_schematic), [[(0, 0), (10, 0)], [(10, 0), (10, 10)]]
+        )
+        await schematic_editor.add_labels_bulk(
+            str(editable_schematic),
+            [{"text": "BULK_A", "x": 0, "y": 0}, {"text": "BULK_B", "x": 10, "y": 10}],
+        )
+
+        content = editable_schematic.read_text()
+        assert content.count("(xy 10 0)") == 2
+        assert content.rstrip().endswith(")")
+        nets = {n.name for n in SchematicParser(str(editable_schematic)).get_nets()}
+        assert {"BULK_A", "BULK_B"} <= nets
+
+
+class TestSymbolPins:
+    """Test the pin definition tables."""
+
+    def test_known_symbol_pins_are_aligned(self):
+        """Numbers, types and names line up index for index."""
+        assert schematic_editor.get_pins_for_symbol("Device", "LED") == (1, 2)
+        assert schematic_editor.SYMBOL_PINS_TYPES["Device:LED"] == ("passive", "passive")
+        assert schematic_editor.SYMBOL_PINS_NAMES["Device:LED"] == ("K", "A")
+
+    def test_unknown_symbol_defaults_to_two_pins(self):
+        """Symbols without a table entry get pins 1 and 2."""
+        assert schematic_editor.get_pins_for_symbol("Foo", "Bar") == (1, 2)
+
+
+class TestVerboseResults:
+    """Test the verbose flag on editor results."""
+
+    async def test_add_component_terse_by_default(self, editable_schematic):
+        """The default result is a single line."""
+        result = await schematic_editor.add_component_from_library(
+            str(editable_schematic), "Device", "R", "R98", "1k"
+        )
+        assert "\n" not in result
+        assert "R98" in result
+
+    async def test_add_wire_verbose_lists_points(self, editable_schematic):
+        """verbose=True echoes the wire points."""
+        result = await schematic_editor.add_wire(
+            str(editable_schematic), [(0, 0), (5, 5)], verbose=True
+        )
+        assert "(5, 5)" in result
+
+
+class TestEntryFormatting:
+    """Test coordinate formatting in generated entries."""
+
+    def test_whole_numbers_drop_trailing_zero(self):
+        """Float coordinates with no fraction print like integers."""
+        assert "(xy 100 50)" in schematic_editor._wire_entry([(100.0, 50.0)])
+
+    def test_float_noise_is_trimmed_without_losing_precision(self):
+        """Binary float noise is dropped, real fractional digits are kept."""
+        entry = schematic_editor._wire_entry([(0.1 + 0.2, 123.4567)])
+        assert "(xy 0.3 123.4567)" in entry
+
+
+class TestSchematicSession:
+    """Test in-memory editing sessions."""
+
+    async def test_edits_held_until_commit(self, editable_schematic):
+        """Session edits only reach the file on commit."""
+        before = editable_schematic.read_bytes()
+        await schematic_editor.open_schematic_session(str(editable_schematic))
+        try:
+            await schematic_editor.add_component_from_library(
+                str(editable_schematic), "Device", "R", "R97", "4k7"
+            )
+            await schematic_editor.add_label(str(editable_schematic), "SESSION_NET", 1, 2)
+            assert editable_schematic.read_bytes() == before
+        finally:
+            result = await schematic_editor.commit_schematic(str(editable_schematic))
+        assert "committed" in result
+
+        parser = SchematicParser(str(editable_schematic))
+        assert parser.get_component_by_reference("R97").value == "4k7"
+        assert "SESSION_NET" in {n.name for n in parser.get_nets()}
+
+    async def test_session_matches_direct_edits(self, editable_schematic, tmp_path):
+        """A session produces the same bytes as editing the file directly."""
+        direct = tmp_path / "direct.kicad_sch"
+        direct.write_bytes(editable_schematic.read_bytes())
+
+        await schematic_editor.add_wires_bulk(str(direct), [[(0, 0), (1, 1)]])
+        await schematic_editor.open_schematic_session(str(editable_schematic))
+        await schematic_editor.add_wires_bulk(str(editable_schematic), [[(0, 0), (1, 1)]])
+        await schematic_editor.commit_schematic(str(editable_schematic))
+
+        assert editable_schematic.read_bytes() == direct.read_bytes()
+
+    async def test_edit_during_commit_is_kept(self, editable_schematic):
+        """An edit racing a commit lands in the file instead of being dropped."""
+        await schematic_editor.open_schematic_session(str(editable_schematic))
+
+        _, result = await asyncio.gather(
+            schematic_editor.commit_schematic(str(editable_schematic)),
+            schematic_editor.add_label(str(editable_schematic), "LATE", 1, 2),
+        )
+
+        assert "added" in result
+        assert '(label "LATE"' in editable_schematic.read_text()
+
+    async def test_concurrent_opens_keep_one_session(self, editable_schematic):
+        """A second concurrent open does not replace the first session."""
+        results = await asyncio.gather(
+            schematic_editor.open_schematic_session(str(editable_schematic)),
+            schematic_editor.add_label(str(editable_schematic), "EARLY", 1, 2),
+            schematic_editor.open_schematic_session(str(editable_schematic)),
+        )
+        try:
+            assert sum("already open" in r for r in results) == 1
+        finally:
+            await schematic_editor.commit_schematic(str(editable_schematic))
+
+        assert '(label "EARLY"' in editable_schematic.read_text()
+
+    async def test_discard_drops_edits(self, editable_schematic):
+        """Discarding a session leaves the file untouched and allows reopening."""
+        before = editable_schematic.read_bytes()
+        await schematic_editor.open_schematic_session(str(editable_schematic))
+        await schematic_editor.add_label(str(editable_schematic), "DROPPED", 1, 2)
+
+        result = await schematic_editor.discard_schematic_session(str(editable_schematic))
+
+        assert "discarded" in result
+        assert editable_schematic.read_bytes() == before
+        result = await schematic_editor.open_schematic_session(str(editable_schematic))
+        assert "Session opened" in result
+        await schematic_editor.discard_schematic_session(str(editable_schematic))
+
+    async def test_discard_without_session(self, editable_schematic):
+        """Discarding a file with no open session is an error."""
+        result = await schematic_editor.discard_schematic_session(str(editable_schematic))
+        assert result.startswith("Error")
+
+    async def test_commit_without_session(self, editable_schematic):
+        """Committing a file with no open session is an error."""
+        result = await schematic_editor.commit_schematic(str(editable_schematic))
+        assert result.startswith("Error")